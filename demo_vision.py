@@ -5,17 +5,45 @@ Vision Module Demo - MediaPipe + FER Architecture
 """
 
 import sys
+import time
 import cv2
+from datetime import datetime
 from pathlib import Path
 
 # 添加项目路径
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.perception.vision import VisionPerceptor, detect_emotion_from_image
+from src.perception.human_face import VisionPerceptor, detect_emotion_from_image
+
+# 实时状态行模板（预先构建，主循环中只做 format）
+STATUS_TEMPLATE = (
+    "\rFrame {n} | Emotion: {e:8s} ({c:.1%}) | "
+    "VAD: V={v:+.2f} A={a:.2f} D={d:+.2f} | Detector: {det:9s}"
+)
+NO_FACE_TEMPLATE = "\rFrame {n} | No face detected"
+SCREENSHOT_JPEG_QUALITY = 85
+WINDOW_NAME = "AICO Emotion Detection"
+STATUS_INTERVAL = 0.1  # 状态行最多每0.1秒刷新一次（10Hz）
+
+
+def annotate_frame(frame, percept):
+    """在帧的副本上绘制人脸框和情感标签（不修改流水线持有的帧）"""
+    annotated = frame.copy()
+    if percept:
+        emotion = percept.metadata['dominant_emotion']
+        x, y, w, h = percept.metadata['bounding_box']
+        cv2.rectangle(annotated, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        cv2.putText(annotated, f"{emotion} {percept.confidence:.0%}", (x, max(y - 10, 20)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+    return annotated
 
 
 def demo_real_time_detection():
-    """实时摄像头情感检测演示"""
+    """实时摄像头情感检测演示
+    
+    采集、人脸检测、情感分析运行在独立线程组成的流水线中，
+    主循环只负责取出最新结果并显示。
+    """
     print("=" * 60)
     print("Real-time Emotion Detection Demo")
     print("=" * 60)
@@ -25,39 +53,56 @@ def demo_real_time_detection():
     # 创建检测器（默认使用MediaPipe）
     with VisionPerceptor(camera_id=0, use_mediapipe=True) as vp:
         print(f"Detector initialized: {'MediaPipe' if vp.use_mediapipe else 'Haar Cascade'}")
+        vp.start_pipeline()
         
+        cv2.namedWindow(WINDOW_NAME)
         frame_count = 0
+        last_print = 0.0
+        annotated = None
         while True:
-            percept = vp.perceive()
+            # 等待流水线输出新结果（超时则沿用上一次结果）
+            frame, percept = vp.get_latest_result(timeout=0.1)
             frame_count += 1
             
-            if percept:
-                # 显示检测结果
-                emotion = percept.metadata['dominant_emotion']
-                conf = percept.confidence
-                v = percept.valence_hint
-                a = percept.arousal_hint
-                d = percept.dominance_hint
-                detector = percept.metadata.get('detector', 'unknown')
-                
-                print(f"\rFrame {frame_count} | "
-                      f"Emotion: {emotion.upper():8s} ({conf:.1%}) | "
-                      f"VAD: V={v:+.2f} A={a:.2f} D={d:+.2f} | "
-                      f"Detector: {detector:9s}", end='')
-            else:
-                print(f"\rFrame {frame_count} | No face detected", end='')
+            # 显示带标注的画面（键盘事件也需要窗口才能接收）
+            if frame is not None:
+                annotated = annotate_frame(frame, percept)
+                cv2.imshow(WINDOW_NAME, annotated)
+            
+            # 显示检测结果（限制刷新频率，终端输出较慢时不拖慢主循环）
+            now = time.monotonic()
+            if now - last_print >= STATUS_INTERVAL:
+                last_print = now
+                if percept:
+                    sys.stdout.write(STATUS_TEMPLATE.format(
+                        n=frame_count,
+                        e=percept.metadata['dominant_emotion'].upper(),
+                        c=percept.confidence,
+                        v=percept.valence_hint,
+                        a=percept.arousal_hint,
+                        d=percept.dominance_hint,
+                        det=percept.metadata.get('detector', 'unknown')
+                    ))
+                else:
+                    sys.stdout.write(NO_FACE_TEMPLATE.format(n=frame_count))
+                sys.stdout.flush()
             
             # 键盘控制
             key = cv2.waitKey(1) & 0xFF
             if key == ord('q'):
                 break
-            elif key == ord('s') and percept:
-                # 保存截图
-                timestamp = __import__('datetime').datetime.now().strftime('%Y%m%d_%H%M%S')
+            elif key == ord('s') and percept and annotated is not None:
+                # 保存当前显示的带标注画面（人脸框 + 情感标签）
+                emotion = percept.metadata['dominant_emotion']
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 filename = f"screenshot_{emotion}_{timestamp}.jpg"
-                # Note: 实际项目中需要保存带标注的图像
-                print(f"\n  Saved: {filename}")
+                
+                if cv2.imwrite(filename, annotated, [cv2.IMWRITE_JPEG_QUALITY, SCREENSHOT_JPEG_QUALITY]):
+                    print(f"\n  Saved: {filename}")
+                else:
+                    print(f"\n  Failed to save: {filename}")
     
+    cv2.destroyAllWindows()
     print("\n\nDemo finished!")
 
 
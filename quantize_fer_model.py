@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+FER情感分类模型 INT8 训练后量化
+将FER库自带的Keras模型转换为全整数 TFLite 模型，供
+VisionPerceptor(quantized=True) 使用
+
+用法:
+  python quantize_fer_model.py <校准图片目录> [--output models/fer_emotion_int8.tflite]
+
+校准图片应为人脸裁剪图像（任意尺寸，彩色或灰度），几百张即可。
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.perception.emotion_classifier import preprocess_face, FER_INPUT_SIZE
+
+DEFAULT_OUTPUT = Path(__file__).parent / "models" / "fer_emotion_int8.tflite"
+IMAGE_SUFFIXES = {'.jpg', '.jpeg', '.png', '.bmp'}
+
+
+def load_fer_keras_model():
+    """加载FER库自带的情感分类Keras模型"""
+    import fer
+    from tensorflow.keras.models import load_model
+    
+    model_path = Path(fer.__file__).parent / "data" / "emotion_model.hdf5"
+    return load_model(str(model_path), compile=False)
+
+
+def representative_dataset(calibration_dir: Path, limit: int):
+    """校准数据生成器（与推理时相同的预处理）"""
+    images = sorted(
+        p for p in calibration_dir.rglob('*')
+        if p.suffix.lower() in IMAGE_SUFFIXES
+    )[:limit]
+    
+    if not images:
+        raise FileNotFoundError(f"No calibration images found in {calibration_dir}")
+    
+    print(f"Using {len(images)} calibration images")
+    for image_path in images:
+        img = cv2.imread(str(image_path))
+        if img is None:
+            continue
+        x = preprocess_face(img).reshape(1, *FER_INPUT_SIZE[::-1], 1)
+        yield [x.astype(np.float32)]
+
+
+def quantize(calibration_dir: Path, output_path: Path, limit: int = 300):
+    """执行 INT8 训练后量化"""
+    import tensorflow as tf
+    
+    model = load_fer_keras_model()
+    
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = lambda: representative_dataset(calibration_dir, limit)
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.int8
+    converter.inference_output_type = tf.int8
+    
+    tflite_model = converter.convert()
+    
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_bytes(tflite_model)
+    print(f"✓ Saved: {output_path} ({len(tflite_model) / 1024:.1f} KB)")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="FER情感分类模型 INT8 量化")
+    parser.add_argument("calibration_dir", type=Path, help="校准用人脸图片目录")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="输出 TFLite 模型路径")
+    parser.add_argument("--limit", type=int, default=300, help="最多使用的校准图片数")
+    args = parser.parse_args()
+    
+    quantize(args.calibration_dir, args.output, args.limit)
+
+
+if __name__ == "__main__":
+    main()
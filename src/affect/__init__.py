@@ -3,6 +3,7 @@
 本模块包含情感系统的核心数据结构和配置管理：
 - state: 情感状态定义（AffectState, Percept, ExpressionCommand）
 - personality: 人格配置管理
+- percept_buffer: 感知缓冲区（列式布局，用于多模态融合）
 - inference: 情感推断引擎（待实现）
 """
 
@@ -12,17 +13,32 @@ from .state import (
     ExpressionCommand,
     EmotionCategory,
     emotion_to_vad,
+    emotion_name_to_vad,
+    soft_emotion_to_vad,
+    fuse_vad,
     EMOTION_TO_VAD,
+    EMOTION_ORDER,
+    EMOTION_VAD_TABLE,
 )
 
 from .personality import Personality
 
+from .percept_buffer import PerceptBuffer, SOURCE_IDS, fusion_weight_vector
+
 __all__ = [
     'AffectState',
     'Percept',
     'ExpressionCommand',
     'EmotionCategory',
     'emotion_to_vad',
+    'emotion_name_to_vad',
+    'soft_emotion_to_vad',
+    'fuse_vad',
     'EMOTION_TO_VAD',
+    'EMOTION_ORDER',
+    'EMOTION_VAD_TABLE',
     'Personality',
+    'PerceptBuffer',
+    'SOURCE_IDS',
+    'fusion_weight_vector',
 ]
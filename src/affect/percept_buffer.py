@@ -0,0 +1,114 @@
+"""感知缓冲区
+
+以列式（struct-of-arrays）布局保存最近的感知输入。
+与 list[Percept] 相比，各字段分别存放在连续的 float32/uint8 数组中，
+多模态融合只需对这几个数组做一次向量化运算，无需逐个访问 Percept 对象。
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from .state import Percept, fuse_vad
+
+# 感知来源到编号的映射（source_ids 数组中存放的值）
+SOURCE_IDS = {
+    "vision": 0,
+    "audio": 1,
+    "language": 2,
+    "interaction": 3,
+    "time": 4,
+}
+
+
+def fusion_weight_vector(weights: Dict[str, float]) -> np.ndarray:
+    """将按模态名称给出的融合权重转换为按 SOURCE_IDS 编号索引的数组
+    
+    Args:
+        weights: 融合权重字典，如 {"vision": 0.4, "audio": 0.3, "language": 0.3}
+    
+    Returns:
+        长度为 len(SOURCE_IDS) 的 float32 数组，未给出权重的来源为0
+    """
+    vector = np.zeros(len(SOURCE_IDS), dtype=np.float32)
+    for source, weight in weights.items():
+        if source in SOURCE_IDS:
+            vector[SOURCE_IDS[source]] = weight
+    return vector
+
+
+class PerceptBuffer:
+    """最近感知输入的环形缓冲区（列式布局）
+    
+    缓冲区满后新的感知覆盖最旧的感知。
+    
+    示例用法：
+        buffer = PerceptBuffer(capacity=64)
+        buffer.push(percept)
+        vad = buffer.fuse(fusion_weight_vector(personality.fusion_weights))
+    """
+    
+    def __init__(self, capacity: int = 64):
+        """创建缓冲区
+        
+        Args:
+            capacity: 最多保存的感知数量
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity 必须为正数，实际为 {capacity}")
+        
+        self.capacity = capacity
+        self.hints = np.empty((capacity, 3), dtype=np.float32)   # valence/arousal/dominance 提示
+        self.confidences = np.empty(capacity, dtype=np.float32)
+        self.source_ids = np.empty(capacity, dtype=np.uint8)
+        self.timestamps = np.empty(capacity, dtype=np.float64)
+        self._head = 0   # 下一次写入的位置
+        self._size = 0
+    
+    def push(self, percept: Percept):
+        """写入一条感知
+        
+        Args:
+            percept: 感知输入
+        
+        Raises:
+            ValueError: 感知来源不在 SOURCE_IDS 中
+        """
+        source_id = SOURCE_IDS.get(percept.source)
+        if source_id is None:
+            raise ValueError(f"未知的感知来源: {percept.source}")
+        
+        i = self._head
+        self.hints[i] = (percept.valence_hint, percept.arousal_hint, percept.dominance_hint)
+        self.confidences[i] = percept.confidence
+        self.source_ids[i] = source_id
+        self.timestamps[i] = percept.timestamp
+        
+        self._head = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+    
+    def fuse(self, weights: np.ndarray) -> Optional[np.ndarray]:
+        """融合缓冲区内所有感知的VAD提示
+        
+        每条感知的权重为 weights[来源编号] * 置信度。
+        
+        Args:
+            weights: 按 SOURCE_IDS 编号索引的融合权重数组（见 fusion_weight_vector）
+        
+        Returns:
+            融合后的 (3,) float32 VAD 数组；缓冲区为空或权重全为0时返回None
+        """
+        n = self._size
+        if n == 0:
+            return None
+        
+        weights = np.asarray(weights, dtype=np.float32)
+        return fuse_vad(self.hints[:n], weights[self.source_ids[:n]], self.confidences[:n])
+    
+    def clear(self):
+        """清空缓冲区"""
+        self._head = 0
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
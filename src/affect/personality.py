@@ -12,22 +12,81 @@
 """
 
 import yaml
+import copy
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Any, Dict, Optional
 import logging
 
+from .percept_buffer import PerceptBuffer, fusion_weight_vector
+
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml C扩展
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _parse_yaml(path: str, mtime_ns: int) -> Any:
+    """解析YAML文件（按路径和修改时间缓存，文件修改后自动失效）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
+def _load_yaml(path: Path) -> Any:
+    """加载YAML文件，返回缓存结果的副本（调用方可自由修改）"""
+    parsed = _parse_yaml(str(path.resolve()), path.stat().st_mtime_ns)
+    return copy.deepcopy(parsed)
+
+
 class Personality:
     """人格配置管理器
     
+    所有人格参数在加载时一次性解析为实例属性（默认配置 + 文件配置合并），
+    推断循环中逐帧读取时只是一次普通属性访问，不再经过 dict.get。
+    
+    Attributes:
+        name: 人格名称
+        emotional_gain: 情绪敏感度 [0, 2]，典型值 0.5（迟钝）~ 1.0（正常）~ 1.5（敏感）
+        recovery_rate: 情绪恢复速度 [0, 1]，典型值 0.005（慢）~ 0.01（正常）~ 0.02（快）
+        expressiveness: 表达强度 [0, 1]，影响表达指令的能量等级
+        baseline_valence: 愉悦度基线 [-1, 1]
+        baseline_arousal: 激活度基线 [0, 1]
+        baseline_dominance: 主导度基线 [-1, 1]
+        inertia_valence: 愉悦度惯性系数 [0, 1]
+        inertia_arousal: 激活度惯性系数 [0, 1]
+        inertia_dominance: 主导度惯性系数 [0, 1]
+        fusion_weights: 多模态融合权重，键为模态名称（vision/audio/language）
+        fusion_weight_array: 按 SOURCE_IDS 编号索引的融合权重数组（加载时预先计算）
+        fuse: 绑定了本人格融合权重的融合函数，fuse(buffer) 等价于
+            buffer.fuse(fusion_weight_array)
+    
     示例用法：
         personality = Personality("config/personality.yaml")
         gain = personality.emotional_gain
         weights = personality.fusion_weights
     """
     
+    __slots__ = (
+        'config_path',
+        'cfg',
+        'name',
+        'emotional_gain',
+        'recovery_rate',
+        'expressiveness',
+        'baseline_valence',
+        'baseline_arousal',
+        'baseline_dominance',
+        'inertia_valence',
+        'inertia_arousal',
+        'inertia_dominance',
+        'fusion_weights',
+        'fusion_weight_array',
+        'fuse',
+    )
+    
     def __init__(self, config_path: str = "config/personality.yaml"):
         """加载人格配置
         
@@ -45,13 +104,37 @@ class Personality:
             self.cfg = self._default_config()
         else:
             try:
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    config = yaml.safe_load(f)
-                    self.cfg = config.get('personality', {})
+                config = _load_yaml(self.config_path)
+                self.cfg = config.get('personality', {})
                 logger.info(f"成功加载人格配置: {self.cfg.get('name', 'Unknown')}")
             except yaml.YAMLError as e:
                 logger.error(f"配置文件格式错误: {e}")
                 raise
+        
+        self._resolve()
+    
+    def _resolve(self):
+        """将配置解析为实例属性（文件中缺失的键使用默认值）"""
+        merged = {**self._default_config(), **self.cfg}
+        
+        self.name = str(self.cfg.get('name', 'Unknown'))
+        self.emotional_gain = float(merged['emotional_gain'])
+        self.recovery_rate = float(merged['recovery_rate'])
+        self.expressiveness = float(merged['expressiveness'])
+        self.baseline_valence = float(merged['baseline_valence'])
+        self.baseline_arousal = float(merged['baseline_arousal'])
+        self.baseline_dominance = float(merged['baseline_dominance'])
+        self.inertia_valence = float(merged['inertia_valence'])
+        self.inertia_arousal = float(merged['inertia_arousal'])
+        self.inertia_dominance = float(merged['inertia_dominance'])
+        self.fusion_weights = {
+            modality: float(weight)
+            for modality, weight in merged['fusion_weights'].items()
+        }
+        
+        # 融合权重运行期不变，加载时即转换为数组并绑定到融合函数
+        self.fusion_weight_array = fusion_weight_vector(self.fusion_weights)
+        self.fuse = partial(PerceptBuffer.fuse, weights=self.fusion_weight_array)
     
     def _default_config(self) -> Dict[str, Any]:
         """默认人格配置（当配置文件不存在时使用）"""
@@ -86,81 +169,6 @@ class Personality:
         """
         return self.cfg.get(key, default)
     
-    @property
-    def name(self) -> str:
-        """人格名称"""
-        return self.cfg.get('name', 'Unknown')
-    
-    @property
-    def emotional_gain(self) -> float:
-        """情绪敏感度 [0, 2]
-        
-        - 值越大，情绪变化越剧烈
-        - 典型值：0.5（迟钝）~ 1.0（正常）~ 1.5（敏感）
-        """
-        return self.cfg.get('emotional_gain', 0.7)
-    
-    @property
-    def recovery_rate(self) -> float:
-        """情绪恢复速度 [0, 1]
-        
-        - 值越大，情绪恢复到基线越快
-        - 典型值：0.005（慢）~ 0.01（正常）~ 0.02（快）
-        """
-        return self.cfg.get('recovery_rate', 0.01)
-    
-    @property
-    def expressiveness(self) -> float:
-        """表达强度 [0, 1]
-        
-        - 值越大，情绪外显越明显
-        - 影响表达指令的能量等级
-        """
-        return self.cfg.get('expressiveness', 0.8)
-    
-    @property
-    def baseline_valence(self) -> float:
-        """愉悦度基线 [-1, 1]"""
-        return self.cfg.get('baseline_valence', 0.2)
-    
-    @property
-    def baseline_arousal(self) -> float:
-        """激活度基线 [0, 1]"""
-        return self.cfg.get('baseline_arousal', 0.4)
-    
-    @property
-    def baseline_dominance(self) -> float:
-        """主导度基线 [-1, 1]"""
-        return self.cfg.get('baseline_dominance', 0.1)
-    
-    @property
-    def inertia_valence(self) -> float:
-        """愉悦度惯性系数 [0, 1]"""
-        return self.cfg.get('inertia_valence', 0.85)
-    
-    @property
-    def inertia_arousal(self) -> float:
-        """激活度惯性系数 [0, 1]"""
-        return self.cfg.get('inertia_arousal', 0.75)
-    
-    @property
-    def inertia_dominance(self) -> float:
-        """主导度惯性系数 [0, 1]"""
-        return self.cfg.get('inertia_dominance', 0.90)
-    
-    @property
-    def fusion_weights(self) -> Dict[str, float]:
-        """多模态融合权重
-        
-        Returns:
-            字典，键为模态名称（vision/audio/language），值为权重
-        """
-        return self.cfg.get('fusion_weights', {
-            'vision': 0.4,
-            'audio': 0.3,
-            'language': 0.3
-        })
-    
     def save(self, path: Optional[str] = None):
         """保存当前配置到文件
         
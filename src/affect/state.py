@@ -9,9 +9,40 @@
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import time
 
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
+
+
+def _json_default(obj: Any) -> Any:
+    """标准库 json 的兜底转换（NumPy 数组/标量）"""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_json(obj: Any) -> bytes:
+    """序列化为 UTF-8 JSON 字节串（日志、遥测等高频路径使用）
+    
+    优先使用 orjson（直接输出 bytes，支持 NumPy 数组和非字符串键；
+    非 C 连续的数组视图交给 _json_default 转换），未安装时回退到标准库 json。
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            obj,
+            default=_json_default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(obj, ensure_ascii=False, default=_json_default).encode('utf-8')
+
 
 class EmotionCategory(Enum):
     """离散情感类别（用于标注和调试）
@@ -30,7 +61,6 @@ class EmotionCategory(Enum):
     DISGUST = "disgust"
 
 
-@dataclass
 class AffectState:
     """VAD情感状态空间
     
@@ -43,41 +73,137 @@ class AffectState:
     - Mood（心境）: 长期情绪倾向
     - Fatigue（疲劳）: 资源消耗状态
     - Trust（信任）: 与用户的关系变量
+    
+    六个维度连续存放在一个长度为6的 ndarray 中（_vec），
+    clamp 等整体运算只需一次 NumPy 调用；各维度仍通过同名属性读写。
     """
     
-    # VAD 核心维度
-    valence: float = 0.0      # [-1, 1] 不愉快 → 愉快
-    arousal: float = 0.5      # [0, 1]  平静 → 激动
-    dominance: float = 0.0    # [-1, 1] 被动 → 主动
+    __slots__ = ('_vec', 'timestamp')
     
-    # 长期状态变量
-    mood: float = 0.0         # [-1, 1] 长期情绪（慢变量，分钟~小时级）
-    fatigue: float = 0.0      # [0, 1]  疲劳/资源消耗
-    trust: float = 0.5        # [0, 1]  与当前用户的信任关系
+    # 各维度的取值范围，顺序与 _vec 一致：
+    # valence, arousal, dominance, mood, fatigue, trust
+    _LO = np.array([-1.0, 0.0, -1.0, -1.0, 0.0, 0.0])
+    _HI = np.array([1.0, 1.0, 1.0, 1.0, 1.0, 1.0])
+    _KEYS = ("valence", "arousal", "dominance", "mood", "fatigue", "trust")
     
-    # 元数据
-    timestamp: float = field(default_factory=time.time)
+    def __init__(
+        self,
+        valence: float = 0.0,      # [-1, 1] 不愉快 → 愉快
+        arousal: float = 0.5,      # [0, 1]  平静 → 激动
+        dominance: float = 0.0,    # [-1, 1] 被动 → 主动
+        mood: float = 0.0,         # [-1, 1] 长期情绪（慢变量，分钟~小时级）
+        fatigue: float = 0.0,      # [0, 1]  疲劳/资源消耗
+        trust: float = 0.5,        # [0, 1]  与当前用户的信任关系
+        timestamp: Optional[float] = None
+    ):
+        self._vec = np.array(
+            [valence, arousal, dominance, mood, fatigue, trust],
+            dtype=np.float64
+        )
+        self.timestamp = time.time() if timestamp is None else timestamp
+    
+    @property
+    def valence(self) -> float:
+        return float(self._vec[0])
+    
+    @valence.setter
+    def valence(self, value: float):
+        self._vec[0] = value
+    
+    @property
+    def arousal(self) -> float:
+        return float(self._vec[1])
+    
+    @arousal.setter
+    def arousal(self, value: float):
+        self._vec[1] = value
+    
+    @property
+    def dominance(self) -> float:
+        return float(self._vec[2])
+    
+    @dominance.setter
+    def dominance(self, value: float):
+        self._vec[2] = value
+    
+    @property
+    def mood(self) -> float:
+        return float(self._vec[3])
+    
+    @mood.setter
+    def mood(self, value: float):
+        self._vec[3] = value
+    
+    @property
+    def fatigue(self) -> float:
+        return float(self._vec[4])
+    
+    @fatigue.setter
+    def fatigue(self, value: float):
+        self._vec[4] = value
+    
+    @property
+    def trust(self) -> float:
+        return float(self._vec[5])
+    
+    @trust.setter
+    def trust(self, value: float):
+        self._vec[5] = value
     
     def clamp(self):
         """边界约束，确保所有值在有效范围内"""
-        self.valence = max(-1.0, min(1.0, self.valence))
-        self.arousal = max(0.0, min(1.0, self.arousal))
-        self.dominance = max(-1.0, min(1.0, self.dominance))
-        self.mood = max(-1.0, min(1.0, self.mood))
-        self.fatigue = max(0.0, min(1.0, self.fatigue))
-        self.trust = max(0.0, min(1.0, self.trust))
+        np.clip(self._vec, self._LO, self._HI, out=self._vec)
     
     def to_dict(self) -> Dict[str, Any]:
-        """转换为字典（用于日志、序列化）"""
-        return {
-            "valence": round(self.valence, 3),
-            "arousal": round(self.arousal, 3),
-            "dominance": round(self.dominance, 3),
-            "mood": round(self.mood, 3),
-            "fatigue": round(self.fatigue, 3),
-            "trust": round(self.trust, 3),
-            "timestamp": self.timestamp
-        }
+        """转换为字典（用于日志、序列化）
+        
+        各维度经过边界约束并保留3位小数（一次NumPy运算完成），不修改状态本身。
+        """
+        values = np.round(np.clip(self._vec, self._LO, self._HI), 3)
+        return {**dict(zip(self._KEYS, values.tolist())), "timestamp": self.timestamp}
+    
+    @classmethod
+    def to_dict_batch(
+        cls,
+        states: np.ndarray,
+        timestamps: Optional[List[float]] = None
+    ) -> List[Dict[str, Any]]:
+        """批量转换 (N, 6) 状态数组为字典列表（如会话结束时导出日志）
+        
+        Args:
+            states: (N, 6) 数组，列顺序为 valence, arousal, dominance, mood, fatigue, trust
+            timestamps: 每行对应的时间戳（可选）
+            
+        Returns:
+            字典列表，格式与 to_dict() 相同
+            
+        Raises:
+            ValueError: timestamps 长度与状态行数不一致
+        """
+        values = np.round(np.clip(np.asarray(states, dtype=np.float64), cls._LO, cls._HI), 3)
+        if timestamps is None:
+            timestamps = [None] * len(values)
+        
+        return [
+            {**dict(zip(cls._KEYS, row)), "timestamp": timestamp}
+            for row, timestamp in zip(values.tolist(), timestamps, strict=True)
+        ]
+    
+    def to_json_bytes(self) -> bytes:
+        """序列化为紧凑的JSON数组字节串（用于高频日志、遥测）
+        
+        格式为 [valence, arousal, dominance, mood, fatigue, trust, timestamp]，
+        数值不做舍入，可无损还原；人类可读的输出请使用 to_dict()。
+        """
+        return dumps_json(self._vec.tolist() + [self.timestamp])
+    
+    def __repr__(self) -> str:
+        return (
+            f"AffectState(valence={self.valence!r}, arousal={self.arousal!r}, "
+            f"dominance={self.dominance!r}, mood={self.mood!r}, "
+            f"fatigue={self.fatigue!r}, trust={self.trust!r}, "
+            f"timestamp={self.timestamp!r})"
+        )
     
     def __str__(self) -> str:
         """人类可读的字符串表示"""
@@ -87,7 +213,7 @@ class AffectState:
         )
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Percept:
     """感知输入统一接口
     
@@ -110,12 +236,72 @@ class Percept:
     metadata: Optional[Dict[str, Any]] = None
     timestamp: float = field(default_factory=time.time)
     
+    # 提示向量各分量的取值范围：valence_hint, arousal_hint, dominance_hint, confidence
+    _HINT_LO = np.array([-1.0, 0.0, -1.0, 0.0])
+    _HINT_HI = np.array([1.0, 1.0, 1.0, 1.0])
+    
     def __post_init__(self):
-        """验证输入有效性"""
-        assert -1 <= self.valence_hint <= 1, "valence_hint 必须在 [-1, 1] 范围内"
-        assert 0 <= self.arousal_hint <= 1, "arousal_hint 必须在 [0, 1] 范围内"
-        assert -1 <= self.dominance_hint <= 1, "dominance_hint 必须在 [-1, 1] 范围内"
-        assert 0 <= self.confidence <= 1, "confidence 必须在 [0, 1] 范围内"
+        """验证输入有效性，超出范围的值裁剪到有效范围内
+        
+        Raises:
+            ValueError: 提示值或置信度不是有限数值（NaN/Inf）
+        """
+        hints = self._clip_hints(np.array([
+            self.valence_hint, self.arousal_hint,
+            self.dominance_hint, self.confidence
+        ], dtype=np.float64))
+        (self.valence_hint, self.arousal_hint,
+         self.dominance_hint, self.confidence) = hints.tolist()
+    
+    @classmethod
+    def _clip_hints(cls, hints: np.ndarray) -> np.ndarray:
+        """校验并原地裁剪提示向量（形状为 (4,) 或 (N, 4)）"""
+        if not np.isfinite(hints).all():
+            raise ValueError("Percept 的提示值和置信度必须是有限数值")
+        return np.clip(hints, cls._HINT_LO, cls._HINT_HI, out=hints)
+    
+    @classmethod
+    def from_batch(
+        cls,
+        hints: np.ndarray,
+        source: str,
+        metadata_list: Optional[List[Optional[Dict[str, Any]]]] = None
+    ) -> List["Percept"]:
+        """从 (N, 4) 数组批量构建Percept（如同一帧中的多张人脸）
+        
+        Args:
+            hints: (N, 4) 数组，每行为 (valence_hint, arousal_hint, dominance_hint, confidence)
+            source: 感知来源
+            metadata_list: 每个Percept的metadata（可选，长度为N）
+            
+        Returns:
+            Percept列表，顺序与 hints 的行一致
+            
+        Raises:
+            ValueError: 数组形状不是 (N, 4)，包含非有限数值，或 metadata_list 长度与 N 不符
+        """
+        hints = np.array(hints, dtype=np.float64)
+        if hints.ndim != 2 or hints.shape[1] != 4:
+            raise ValueError(f"hints 的形状必须是 (N, 4)，实际为 {hints.shape}")
+        cls._clip_hints(hints)
+        
+        if metadata_list is None:
+            metadata_list = [None] * len(hints)
+        timestamp = time.time()
+        
+        percepts = []
+        for (v, a, d, c), metadata in zip(hints.tolist(), metadata_list, strict=True):
+            # 整批已校验裁剪过，绕过 __init__/__post_init__ 避免逐个重复校验
+            percept = object.__new__(cls)
+            percept.source = source
+            percept.valence_hint = v
+            percept.arousal_hint = a
+            percept.dominance_hint = d
+            percept.confidence = c
+            percept.metadata = metadata
+            percept.timestamp = timestamp
+            percepts.append(percept)
+        return percepts
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -129,6 +315,21 @@ class Percept:
             "timestamp": self.timestamp
         }
     
+    def to_json_bytes(self) -> bytes:
+        """序列化为JSON字节串（用于高频日志、遥测）
+        
+        字段与 to_dict() 相同，但数值不做舍入；metadata 中可包含 NumPy 数组。
+        """
+        return dumps_json({
+            "source": self.source,
+            "valence_hint": self.valence_hint,
+            "arousal_hint": self.arousal_hint,
+            "dominance_hint": self.dominance_hint,
+            "confidence": self.confidence,
+            "metadata": self.metadata,
+            "timestamp": self.timestamp
+        })
+    
     def __str__(self) -> str:
         """人类可读的字符串表示"""
         return (
@@ -137,7 +338,7 @@ class Percept:
         )
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class ExpressionCommand:
     """表达指令抽象
     
@@ -200,6 +401,26 @@ EMOTION_TO_VAD = {
 }
 
 
+# 情感类别的固定顺序（与 EmotionCategory 定义顺序一致）
+EMOTION_ORDER = tuple(emotion.value for emotion in EmotionCategory)
+
+# (7, 3) VAD查找表，第 i 行对应 EMOTION_ORDER[i]
+EMOTION_VAD_TABLE = np.array(
+    [EMOTION_TO_VAD[emotion] for emotion in EmotionCategory],
+    dtype=np.float32
+)
+
+# 情感名称（FER输出的小写字符串）到 EMOTION_VAD_TABLE 行号的映射
+_NAME_TO_IDX = {name: i for i, name in enumerate(EMOTION_ORDER)}
+
+# 未知情感名称对应的默认VAD（中性）
+_DEFAULT_VAD = np.array([0.0, 0.5, 0.0], dtype=np.float32)
+
+# emotion_name_to_vad 返回的是查找表的行视图，禁止写入以免改动共享数据
+EMOTION_VAD_TABLE.flags.writeable = False
+_DEFAULT_VAD.flags.writeable = False
+
+
 def emotion_to_vad(emotion: EmotionCategory) -> tuple[float, float, float]:
     """将离散情感类别转换为VAD坐标
     
@@ -210,3 +431,70 @@ def emotion_to_vad(emotion: EmotionCategory) -> tuple[float, float, float]:
         (valence, arousal, dominance) 元组
     """
     return EMOTION_TO_VAD.get(emotion, (0.0, 0.5, 0.0))
+
+
+def emotion_name_to_vad(name: str) -> np.ndarray:
+    """将情感名称直接转换为VAD坐标
+    
+    直接按名称查表，不经过 EmotionCategory(name) 的枚举查找。
+    
+    Args:
+        name: 情感名称，如 "happy"（即 EmotionCategory 的取值）
+        
+    Returns:
+        (3,) float32 数组 [valence, arousal, dominance]（查找表的只读视图），
+        未知名称返回中性默认值
+    """
+    idx = _NAME_TO_IDX.get(name)
+    if idx is None:
+        return _DEFAULT_VAD
+    return EMOTION_VAD_TABLE[idx]
+
+
+def soft_emotion_to_vad(probs: np.ndarray) -> np.ndarray:
+    """将情感概率分布转换为VAD坐标（按概率加权）
+    
+    与只取主导情感的 emotion_to_vad 不同，这里使用完整的概率分布，
+    结果为 VAD 查找表各行的加权和（一次矩阵乘法）。
+    
+    Args:
+        probs: 形状为 (7,) 或 (N, 7) 的概率数组，列顺序为 EMOTION_ORDER
+        
+    Returns:
+        形状为 (3,) 或 (N, 3) 的 float32 VAD 数组
+    """
+    return np.asarray(probs, dtype=np.float32) @ EMOTION_VAD_TABLE
+
+
+# VAD 各维度的取值范围（valence, arousal, dominance）
+_VAD_LO = np.array([-1.0, 0.0, -1.0], dtype=np.float32)
+_VAD_HI = np.array([1.0, 1.0, 1.0], dtype=np.float32)
+
+
+def fuse_vad(
+    percepts_vad: np.ndarray,
+    weights: np.ndarray,
+    confidences: np.ndarray
+) -> Optional[np.ndarray]:
+    """多个感知提示的加权融合
+    
+    一次加权求和 + 裁剪完成融合，不需要在 Python 层遍历 Percept 对象。
+    每条提示的有效权重为 weights[i] * confidences[i]。
+    
+    Args:
+        percepts_vad: (N, 3) 数组，每行为一个感知的 (valence, arousal, dominance) 提示
+        weights: (N,) 数组，每个感知所属模态的融合权重
+        confidences: (N,) 数组，每个感知的置信度
+        
+    Returns:
+        融合后的 (3,) float32 VAD 数组；没有有效权重时返回 None
+    """
+    hints = np.asarray(percepts_vad, dtype=np.float32).reshape(-1, 3)
+    w = np.asarray(weights, dtype=np.float32) * np.asarray(confidences, dtype=np.float32)
+    
+    total = float(w.sum())
+    if total <= 0.0:
+        return None
+    
+    fused = (w @ hints) / total
+    return np.clip(fused, _VAD_LO, _VAD_HI, out=fused)
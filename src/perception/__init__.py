@@ -3,19 +3,27 @@
 提供多模态情感感知能力：
 - human_face: 人脸检测和表情识别
 - hand_gesture: 手势识别和情感映射
+- emotion_classifier: 表情分类模型后端（INT8量化等）
+
+各子模块依赖 cv2/mediapipe/FER 等较重的库，这里按需导入（PEP 562）：
+只有首次访问对应名称时才加载子模块，仅使用 src.affect 等模块时不产生开销。
 """
 
-from .human_face import (
-    VisionPerceptor,
-    detect_emotion_from_image,
-    visualize_face_analysis,
-    visualize_all_faces
+_HUMAN_FACE_EXPORTS = (
+    'VisionPerceptor',
+    'detect_emotion_from_image',
+    'visualize_face_analysis',
+    'visualize_all_faces',
+    'landmarks_as_dicts',
+    'blendshapes_as_dict',
+    'BLENDSHAPE_NAMES',
+    'close_perceptors',
 )
 
-from .hand_gesture import (
-    HandGesturePerceptor,
-    detect_gesture_from_image,
-    visualize_hand_gesture
+_HAND_GESTURE_EXPORTS = (
+    'HandGesturePerceptor',
+    'detect_gesture_from_image',
+    'visualize_hand_gesture',
 )
 
 __all__ = [
@@ -24,8 +32,22 @@ __all__ = [
     'detect_emotion_from_image',
     'visualize_face_analysis',
     'visualize_all_faces',
+    'landmarks_as_dicts',
+    'blendshapes_as_dict',
+    'BLENDSHAPE_NAMES',
+    'close_perceptors',
     # 手势感知
     'HandGesturePerceptor',
     'detect_gesture_from_image',
     'visualize_hand_gesture',
 ]
+
+
+def __getattr__(name):
+    if name in _HUMAN_FACE_EXPORTS:
+        from . import human_face
+        return getattr(human_face, name)
+    if name in _HAND_GESTURE_EXPORTS:
+        from . import hand_gesture
+        return getattr(hand_gesture, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,276 @@
+"""表情分类模型后端
+
+FER库自带的情感分类CNN（输入64x64灰度人脸，输出7类情感概率）在
+Keras中以FP32运行。本模块提供该模型的替代推理后端：
+
+- QuantizedEmotionClassifier: INT8 训练后量化的 TFLite 模型
+  （由 quantize_fer_model.py 生成，体积约为原模型的1/4，CPU推理更快）
+- OnnxEmotionClassifier: 导出为ONNX的模型（onnxruntime，使用 IOBinding
+  绑定预分配的输入/输出缓冲区，逐帧推理不再分配数组；多张人脸可批量推理）
+
+所有后端直接接收人脸裁剪图像（不再做人脸检测），输出与
+FER.detect_emotions() 中 'emotions' 字段相同格式的概率字典。
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, List, Union
+
+import cv2
+import numpy as np
+
+try:
+    from tflite_runtime.interpreter import Interpreter as TFLiteInterpreter
+    TFLITE_AVAILABLE = True
+except ImportError:
+    try:
+        from tensorflow.lite import Interpreter as TFLiteInterpreter
+        TFLITE_AVAILABLE = True
+    except ImportError:
+        TFLiteInterpreter = None
+        TFLITE_AVAILABLE = False
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ort = None
+    ONNXRUNTIME_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# FER模型的输出顺序
+FER_EMOTION_LABELS = ('angry', 'disgust', 'fear', 'happy', 'sad', 'surprise', 'neutral')
+
+# FER模型的输入尺寸（宽, 高）
+FER_INPUT_SIZE = (64, 64)
+
+
+def preprocess_face(face_img: np.ndarray) -> np.ndarray:
+    """将人脸裁剪图像转换为FER模型输入
+    
+    与FER库的预处理一致：灰度化 → 缩放到64x64 → 归一化到 [-1, 1]
+    
+    Args:
+        face_img: 人脸区域图像（BGR格式或灰度）
+    
+    Returns:
+        (64, 64) float32 数组
+    """
+    if face_img.ndim == 3:
+        face_img = cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY)
+    face = cv2.resize(face_img, FER_INPUT_SIZE).astype(np.float32)
+    return (face / 255.0 - 0.5) * 2.0
+
+
+def _is_gray_batch(face_imgs) -> bool:
+    """是否为已缩放到模型输入尺寸的 (N, 64, 64) uint8 灰度批次"""
+    return (
+        isinstance(face_imgs, np.ndarray)
+        and face_imgs.dtype == np.uint8
+        and face_imgs.shape[1:] == FER_INPUT_SIZE[::-1]
+    )
+
+
+class QuantizedEmotionClassifier:
+    """INT8 量化的FER情感分类器（TFLite）
+    
+    示例用法：
+        classifier = QuantizedEmotionClassifier("models/fer_emotion_int8.tflite")
+        emotions = classifier.predict(face_img)
+        # {'angry': 0.01, 'disgust': 0.0, ..., 'happy': 0.93, ...}
+    """
+    
+    def __init__(self, model_path: Union[str, Path], num_threads: int = 2):
+        """加载TFLite模型
+        
+        Args:
+            model_path: INT8 TFLite 模型路径
+            num_threads: 推理线程数
+        
+        Raises:
+            ImportError: 未安装 tflite_runtime 或 tensorflow
+            FileNotFoundError: 模型文件不存在
+        """
+        if not TFLITE_AVAILABLE:
+            raise ImportError("TFLite runtime not available, install tflite-runtime or tensorflow")
+        
+        model_path = Path(model_path)
+        if not model_path.exists():
+            raise FileNotFoundError(f"Quantized emotion model not found: {model_path}")
+        
+        self.interpreter = TFLiteInterpreter(model_path=str(model_path), num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        
+        input_details = self.interpreter.get_input_details()[0]
+        output_details = self.interpreter.get_output_details()[0]
+        self._input_index = input_details['index']
+        self._input_dtype = input_details['dtype']
+        self._input_scale, self._input_zero_point = input_details['quantization']
+        self._output_index = output_details['index']
+        self._output_scale, self._output_zero_point = output_details['quantization']
+        
+        logger.info(f"✓ Quantized emotion classifier loaded from {model_path.name}")
+    
+    def predict(self, face_img: np.ndarray) -> Dict[str, float]:
+        """预测单张人脸的情感概率
+        
+        Args:
+            face_img: 人脸区域图像（BGR格式）
+        
+        Returns:
+            情感概率字典，键为 FER_EMOTION_LABELS
+        """
+        x = preprocess_face(face_img)
+        
+        # 量化输入
+        if self._input_scale:
+            x = np.round(x / self._input_scale + self._input_zero_point)
+            info = np.iinfo(self._input_dtype)
+            x = np.clip(x, info.min, info.max)
+        x = x.astype(self._input_dtype).reshape(1, *FER_INPUT_SIZE[::-1], 1)
+        
+        self.interpreter.set_tensor(self._input_index, x)
+        self.interpreter.invoke()
+        output = self.interpreter.get_tensor(self._output_index)[0]
+        
+        # 反量化输出
+        probs = output.astype(np.float32)
+        if self._output_scale:
+            probs = (probs - self._output_zero_point) * self._output_scale
+        
+        return dict(zip(FER_EMOTION_LABELS, probs.tolist()))
+
+
+class OnnxEmotionClassifier:
+    """ONNX格式的FER情感分类器（onnxruntime + IOBinding）
+    
+    模型可由FER自带的Keras模型导出，例如：
+        python -m tf2onnx.convert --keras <fer>/data/emotion_model.hdf5 --output models/fer_emotion.onnx
+    
+    输入/输出缓冲区在初始化时分配并通过 IOBinding 绑定到会话，
+    每帧的人脸图像直接缩放、归一化写入输入缓冲区，推理结果写入输出缓冲区。
+    
+    示例用法：
+        classifier = OnnxEmotionClassifier("models/fer_emotion.onnx")
+        emotions = classifier.predict(face_img)
+    """
+    
+    def __init__(self, model_path: Union[str, Path], use_gpu: bool = False):
+        """加载ONNX模型并绑定输入/输出缓冲区
+        
+        Args:
+            model_path: ONNX模型路径
+            use_gpu: onnxruntime 支持CUDA时是否使用GPU推理
+        
+        Raises:
+            ImportError: 未安装 onnxruntime
+            FileNotFoundError: 模型文件不存在
+        """
+        if not ONNXRUNTIME_AVAILABLE:
+            raise ImportError("onnxruntime not available, install onnxruntime or onnxruntime-gpu")
+        
+        model_path = Path(model_path)
+        if not model_path.exists():
+            raise FileNotFoundError(f"ONNX emotion model not found: {model_path}")
+        
+        providers = ['CPUExecutionProvider']
+        if use_gpu and 'CUDAExecutionProvider' in ort.get_available_providers():
+            providers.insert(0, 'CUDAExecutionProvider')
+        self.session = ort.InferenceSession(str(model_path), providers=providers)
+        
+        # 动态维度（如batch）固定为1
+        input_meta = self.session.get_inputs()[0]
+        output_meta = self.session.get_outputs()[0]
+        input_shape = tuple(d if isinstance(d, int) else 1 for d in input_meta.shape)
+        output_shape = tuple(d if isinstance(d, int) else 1 for d in output_meta.shape)
+        self._input_name = input_meta.name
+        self._output_name = output_meta.name
+        self._input_shape = input_shape
+        self._dynamic_batch = not isinstance(input_meta.shape[0], int)
+        
+        # 批量推理缓冲区（按需扩容）
+        self._batch_gray = np.empty((0, *FER_INPUT_SIZE[::-1]), dtype=np.uint8)
+        self._batch_in = np.empty((0, *FER_INPUT_SIZE[::-1]), dtype=np.float32)
+        
+        # 预分配缓冲区：uint8 灰度缩放结果 + float32 模型输入/输出
+        self._gray_buf = np.empty(FER_INPUT_SIZE[::-1], dtype=np.uint8)
+        self._in_buf = np.empty(input_shape, dtype=np.float32)
+        self._in_view = self._in_buf.reshape(FER_INPUT_SIZE[::-1])   # 与 _in_buf 共享内存
+        self._out_buf = np.empty(output_shape, dtype=np.float32)
+        
+        # 绑定缓冲区地址（非CPU执行提供程序由 onnxruntime 负责拷贝到设备）
+        self._io = self.session.io_binding()
+        self._io.bind_input(
+            input_meta.name, 'cpu', 0, np.float32, input_shape, self._in_buf.ctypes.data
+        )
+        self._io.bind_output(
+            output_meta.name, 'cpu', 0, np.float32, output_shape, self._out_buf.ctypes.data
+        )
+        
+        logger.info(f"✓ ONNX emotion classifier loaded from {model_path.name} "
+                    f"({self.session.get_providers()[0]})")
+    
+    def predict(self, face_img: np.ndarray) -> Dict[str, float]:
+        """预测单张人脸的情感概率
+        
+        Args:
+            face_img: 人脸区域图像（BGR格式或灰度）
+        
+        Returns:
+            情感概率字典，键为 FER_EMOTION_LABELS
+        """
+        if face_img.ndim == 3:
+            face_img = cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY)
+        cv2.resize(face_img, FER_INPUT_SIZE, dst=self._gray_buf)
+        
+        # 与 preprocess_face 相同的归一化：(x / 255 - 0.5) * 2 = x * 2/255 - 1
+        np.multiply(self._gray_buf, 2.0 / 255.0, out=self._in_view)
+        np.subtract(self._in_view, 1.0, out=self._in_view)
+        
+        self.session.run_with_iobinding(self._io)
+        return dict(zip(FER_EMOTION_LABELS, self._out_buf.reshape(-1).tolist()))
+    
+    def predict_batch(
+        self,
+        face_imgs: Union[List[np.ndarray], np.ndarray]
+    ) -> List[Dict[str, float]]:
+        """一次前向推理预测多张人脸的情感概率
+        
+        模型的batch维度为固定值时逐张调用 predict()。
+        
+        Args:
+            face_imgs: 人脸区域图像列表（BGR格式或灰度），或已缩放到
+                模型输入尺寸的 (N, 64, 64) uint8 灰度批次（直接归一化，不再逐张缩放）
+        
+        Returns:
+            情感概率字典列表，与输入顺序一致
+        """
+        n = len(face_imgs)
+        if n == 0:
+            return []
+        if not self._dynamic_batch:
+            return [self.predict(face_img) for face_img in face_imgs]
+        
+        if len(self._batch_in) < n:
+            self._batch_gray = np.empty((n, *FER_INPUT_SIZE[::-1]), dtype=np.uint8)
+            self._batch_in = np.empty((n, *FER_INPUT_SIZE[::-1]), dtype=np.float32)
+        
+        if _is_gray_batch(face_imgs):
+            gray = face_imgs
+        else:
+            gray = self._batch_gray[:n]
+            for i, face_img in enumerate(face_imgs):
+                if face_img.ndim == 3:
+                    face_img = cv2.cvtColor(face_img, cv2.COLOR_BGR2GRAY)
+                cv2.resize(face_img, FER_INPUT_SIZE, dst=gray[i])
+        
+        batch = self._batch_in[:n]
+        np.multiply(gray, 2.0 / 255.0, out=batch)
+        np.subtract(batch, 1.0, out=batch)
+        
+        probs = self.session.run(
+            [self._output_name],
+            {self._input_name: batch.reshape(n, *self._input_shape[1:])}
+        )[0]
+        return [dict(zip(FER_EMOTION_LABELS, row)) for row in probs.reshape(n, -1).tolist()]
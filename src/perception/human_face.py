@@ -26,9 +26,12 @@ MediaPipe管道流程：
 
 import cv2
 import numpy as np
-from typing import Optional, List, Tuple
+from typing import Dict, Optional, List, Tuple, Union
+import inspect
 import logging
 import os
+import queue
+import threading
 from pathlib import Path
 
 try:
@@ -42,29 +45,87 @@ except ImportError:
     logger = logging.getLogger(__name__)
     logger.warning("MediaPipe not available, falling back to Haar Cascade")
 
-from fer.fer import FER
-
-from ..affect.state import Percept, EmotionCategory, emotion_to_vad
+from .emotion_classifier import QuantizedEmotionClassifier, OnnxEmotionClassifier, FER_INPUT_SIZE
+from ..affect.state import (
+    Percept, EmotionCategory, emotion_to_vad,
+    EMOTION_ORDER, EMOTION_TO_VAD,
+)
 import time
 from functools import wraps
 
 logger = logging.getLogger(__name__)
 
 
+# 设置环境变量 AICO_TRACE=1 时启用性能追踪（在导入本模块前设置）
+PERFORMANCE_TRACE_ENABLED = os.environ.get("AICO_TRACE", "") not in ("", "0")
+
+
 def performance_trace(func):
-    """性能追踪装饰器（MediaPipe Tracer模式）"""
+    """性能追踪装饰器（MediaPipe Tracer模式）
+    
+    未启用追踪时直接返回原函数，热路径上没有计时和日志格式化开销。
+    """
+    if not PERFORMANCE_TRACE_ENABLED:
+        return func
+    
     @wraps(func)
     def wrapper(*args, **kwargs):
         start_time = time.perf_counter()
         result = func(*args, **kwargs)
         elapsed = time.perf_counter() - start_time
-        logger.debug(f"{func.__name__} executed in {elapsed*1000:.2f}ms")
+        logger.debug("%s executed in %.2fms", func.__name__, elapsed * 1000)
         return result
     return wrapper
 
 # 项目根目录下的models文件夹
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 MODELS_DIR = PROJECT_ROOT / "models"
+GPU_FACE_DETECTION_MODEL = MODELS_DIR / "face_detection_yunet_2023mar.onnx"
+QUANTIZED_EMOTION_MODEL = MODELS_DIR / "fer_emotion_int8.tflite"
+ONNX_EMOTION_MODEL = MODELS_DIR / "fer_emotion.onnx"
+
+# Face Landmarker 输出的52个混合形状名称（与 face_blendshapes 数组的下标一一对应）
+BLENDSHAPE_NAMES = (
+    '_neutral',
+    'browDownLeft', 'browDownRight', 'browInnerUp', 'browOuterUpLeft', 'browOuterUpRight',
+    'cheekPuff', 'cheekSquintLeft', 'cheekSquintRight',
+    'eyeBlinkLeft', 'eyeBlinkRight',
+    'eyeLookDownLeft', 'eyeLookDownRight', 'eyeLookInLeft', 'eyeLookInRight',
+    'eyeLookOutLeft', 'eyeLookOutRight', 'eyeLookUpLeft', 'eyeLookUpRight',
+    'eyeSquintLeft', 'eyeSquintRight', 'eyeWideLeft', 'eyeWideRight',
+    'jawForward', 'jawLeft', 'jawOpen', 'jawRight',
+    'mouthClose', 'mouthDimpleLeft', 'mouthDimpleRight', 'mouthFrownLeft', 'mouthFrownRight',
+    'mouthFunnel', 'mouthLeft', 'mouthLowerDownLeft', 'mouthLowerDownRight',
+    'mouthPressLeft', 'mouthPressRight', 'mouthPucker', 'mouthRight',
+    'mouthRollLower', 'mouthRollUpper', 'mouthShrugLower', 'mouthShrugUpper',
+    'mouthSmileLeft', 'mouthSmileRight', 'mouthStretchLeft', 'mouthStretchRight',
+    'mouthUpperUpLeft', 'mouthUpperUpRight',
+    'noseSneerLeft', 'noseSneerRight',
+)
+
+
+# 各情感的VAD坐标（Python float 元组），第 i 个对应 EMOTION_ORDER[i]
+_EMOTION_VADS = tuple(EMOTION_TO_VAD[emotion] for emotion in EmotionCategory)
+
+
+def _dominant_emotion_index(emotions: Dict[str, float]) -> Tuple[int, float]:
+    """按 EMOTION_ORDER 的固定顺序取概率最大的情感
+    
+    argmax 只用于选出行号，概率直接从原字典读取，不经过数组转换，
+    保持原始精度。
+    
+    Args:
+        emotions: FER格式的情感概率字典
+    
+    Returns:
+        (EMOTION_ORDER / _EMOTION_VADS 中的行号, 该情感的概率)
+    """
+    probs = np.fromiter(
+        (emotions.get(name, 0.0) for name in EMOTION_ORDER),
+        dtype=np.float64, count=len(EMOTION_ORDER)
+    )
+    idx = int(probs.argmax())
+    return idx, float(emotions.get(EMOTION_ORDER[idx], 0.0))
 
 
 class VisionPerceptor:
@@ -86,17 +147,19 @@ class VisionPerceptor:
         perceptor.release()
     """
     
-    # 情感类别到VAD的映射（基于Russell圆环模型）
-    # 这些映射值来自心理学研究，表示不同情感在VAD空间中的典型位置
-    EMOTION_TO_VAD = {
-        'happy': (0.8, 0.7, 0.5),      # 高愉悦、高激活、略主动
-        'sad': (-0.7, 0.3, -0.3),      # 低愉悦、低激活、略被动
-        'angry': (-0.8, 0.9, 0.7),     # 低愉悦、高激活、很主动
-        'neutral': (0.0, 0.4, 0.0),    # 中性愉悦、略低激活、中性主动
-        'surprise': (0.4, 0.9, -0.2),  # 略正愉悦、很高激活、略被动
-        'fear': (-0.6, 0.8, -0.5),     # 低愉悦、高激活、被动
-        'disgust': (-0.6, 0.5, 0.2),   # 低愉悦、中激活、略主动
-    }
+    # Face Landmarker 默认最多检测的人脸数（请求更多人脸时按需重建，见 _ensure_landmarker_capacity）
+    MAX_LANDMARK_FACES = 5
+    
+    # 丢弃积压帧：grab() 耗时低于该阈值说明取到的是缓冲区中的旧帧
+    STALE_GRAB_THRESHOLD = 2e-3   # 秒
+    MAX_DRAIN_FRAMES = 4          # 每次读取最多丢弃的旧帧数
+    DROP_LOG_INTERVAL = 10.0      # 丢帧统计日志间隔（秒）
+    
+    # 小于该尺寸的人脸裁剪在FER分析失败时放大后重试
+    FER_MIN_FACE_SIZE = 48
+    
+    # Haar检测连续多少帧未检测到人脸后切换直方图均衡化（开 ↔ 关）
+    HAAR_EQUALIZE_MISS_FRAMES = 10
     
     def __init__(
         self,
@@ -104,87 +167,82 @@ class VisionPerceptor:
         use_mediapipe: bool = True,
         use_landmarks: bool = True,
         min_confidence: float = 0.3,
-        detection_confidence: float = 0.5
+        detection_confidence: float = 0.5,
+        quantized: bool = False,
+        device: str = "auto",
+        use_onnx: bool = False,
+        prefer_quality: bool = False
     ):
         """初始化视觉感知器
         
         Args:
-            camera_id: 摄像头设备ID（0为默认摄像头）
+            camera_id: 摄像头设备ID（0为默认摄像头）。传入负数（如 -1）表示只处理
+                传入的图片，此时调用 perceive() 等方法时必须提供 frame
             use_mediapipe: 是否使用MediaPipe进行人脸检测（推荐）
             use_landmarks: 是否使用MediaPipe Face Landmarker检测特征点和表情
             min_confidence: 最低情感置信度阈值
             detection_confidence: MediaPipe人脸检测置信度阈值
+            quantized: 是否使用 INT8 量化的情感分类模型（models/fer_emotion_int8.tflite，
+                由 quantize_fer_model.py 生成）。模型不可用时回退到FER
+            device: 计算设备。"auto"：检测到CUDA时使用GPU；"cuda"：优先GPU；
+                "cpu"：始终使用CPU（便于调试）。MediaPipe任务优先使用TFLite GPU委托；
+                GPU检测使用OpenCV DNN（CUDA后端）运行
+                YuNet模型（models/face_detection_yunet_2023mar.onnx），
+                GPU或模型不可用时使用MediaPipe/Haar
+            use_onnx: 是否使用ONNX格式的情感分类模型（models/fer_emotion.onnx，
+                onnxruntime推理）。优先于 quantized，模型不可用时回退
+            prefer_quality: 帧缩放是否始终使用 INTER_AREA 插值（画质更好但更慢）。
+                默认只在缩小到一半以下时使用 INTER_AREA，其余使用 INTER_LINEAR
         """
         self.camera_id = camera_id
+        self._image_only = camera_id < 0   # 只处理传入的图片，不使用摄像头
+        self.prefer_quality = prefer_quality
         self.min_confidence = min_confidence
         self.detection_confidence = detection_confidence
         self.cap = None
+        self._pipeline_threads: List[threading.Thread] = []
+        self._capture_thread: Optional[threading.Thread] = None   # 仅采集模式（start_capture）
+        self._pipeline_stop = threading.Event()
+        self._frame_queue: queue.Queue = queue.Queue(maxsize=1)
+        self._face_queue: queue.Queue = queue.Queue(maxsize=1)
+        self._percept_queue: queue.Queue = queue.Queue(maxsize=1)
+        self._latest_percept: Optional[Percept] = None
+        # 与最近一次返回的Percept对应的帧（BGR）；同步 perceive() 时可能是复用的缩放缓冲区，
+        # 仅在下一次 perceive() 之前有效
+        self.last_frame: Optional[np.ndarray] = None
         self.use_mediapipe = use_mediapipe and MEDIAPIPE_AVAILABLE
         self.use_landmarks = use_landmarks and MEDIAPIPE_AVAILABLE
         self.face_landmarker = None
-        
-        # 初始化MediaPipe人脸检测
-        if self.use_mediapipe:
-            logger.info("Using MediaPipe Face Detection")
-            try:
-                # 使用MediaPipe的FaceDetection（legacy solution）
-                mp_face_detection = mp.solutions.face_detection
-                self.face_detector = mp_face_detection.FaceDetection(
-                    min_detection_confidence=detection_confidence
-                )
-                self.mp_face_detection = mp_face_detection
-            except AttributeError:
-                # 如果solutions不可用，尝试使用新的tasks API
-                logger.warning("MediaPipe solutions API not available, trying tasks API")
-                try:
-                    # 尝试使用MediaPipe官方模型 (优先级顺序)
-                    model_candidates = [
-                        MODELS_DIR / 'blaze_face_short_range.tflite',  # Google官方轻量模型
-                        MODELS_DIR / 'MediaPipeFaceDetector.tflite',   # 本地模型
-                        MODELS_DIR / 'face_detection.tflite',          # 通用名称
-                    ]
-                    
-                    model_path = None
-                    for candidate in model_candidates:
-                        if candidate.exists():
-                            model_path = candidate
-                            break
-                    
-                    if model_path is None:
-                        raise FileNotFoundError("No MediaPipe face detection model found. Run download_mediapipe_models.sh")
-                    
-                    logger.info(f"Loading MediaPipe model from: {model_path}")
-                    
-                    # 创建FaceDetector的选项
-                    base_options = python.BaseOptions(
-                        model_asset_path=str(model_path)
-                    )
-                    options = mp_vision.FaceDetectorOptions(
-                        base_options=base_options,
-                        min_detection_confidence=detection_confidence,
-                        running_mode=mp_vision.RunningMode.IMAGE
-                    )
-                    self.face_detector = mp_vision.FaceDetector.create_from_options(options)
-                    self.mp_face_detection = None
-                    self.use_new_api = True
-                    logger.info(f"✓ MediaPipe Face Detector initialized with {model_path.name}")
-                except Exception as e:
-                    logger.error(f"Failed to initialize MediaPipe: {e}")
-                    logger.info("Falling back to Haar Cascade")
-                    self.use_mediapipe = False
-                    self.face_detector = None
-                    self.use_new_api = False
-        else:
-            logger.info("Using Haar Cascade Face Detection")
-            self.face_detector = None
-            self.use_new_api = False
+        # 摄像头连续帧使用的VIDEO模式特征点检测器（首次使用时创建，可跨帧跟踪人脸）
+        self.face_landmarker_video = None
+        self._video_landmarker_failed = False
+        self._last_video_timestamp_ms = -1
+        self._landmarker_model_path: Optional[Path] = None
+        self._landmarker_options: dict = {}
+        self.device = device
+        self.use_gpu = device != "cpu"   # 是否尝试GPU加速（GPU不可用时各组件自动回退到CPU）
+        
+        # Haar Cascade 分类器与灰度缓冲区（MediaPipe初始化失败时同样作为回退使用）
+        self._haar_cascade = None
+        self._gray_buf: Optional[np.ndarray] = None
+        self._rgb_buf: Optional[np.ndarray] = None   # MediaPipe输入（每帧只转换一次RGB）
+        self._resize_dst: Optional[np.ndarray] = None   # 预处理缩放的输出缓冲区
+        self._face_batch: Optional[np.ndarray] = None   # 多人脸 (N, 64, 64) 灰度裁剪批次
+        self._haar_equalize = False   # Haar检测前是否对灰度图做直方图均衡化
+        self._haar_miss_frames = 0    # Haar检测连续未检测到人脸的帧数
+        self.dropped_frames = 0   # 读取时丢弃的积压帧总数
+        self.emotion_skipped_frames = 0   # 检测到人脸但FER未能分析情感的帧数
+        self._drop_log_time = 0.0
+        self._drop_log_count = 0
         
         # 初始化MediaPipe FaceLandmarker（用于特征点和表情检测）
         if self.use_landmarks:
             logger.info("Initializing MediaPipe Face Landmarker")
             try:
                 # 查找face_landmarker模型
+                # 优先使用FP16模型（权重体积减半，GPU委托可直接以半精度计算）
                 landmarker_candidates = [
+                    MODELS_DIR / 'face_landmarker_v2_with_blendshapes_fp16.task',
                     MODELS_DIR / 'face_landmarker.task',
                     MODELS_DIR / 'face_landmarker_v2_with_blendshapes.task',
                 ]
@@ -197,20 +255,23 @@ class VisionPerceptor:
                 
                 if landmarker_model_path:
                     logger.info(f"Loading Face Landmarker model from: {landmarker_model_path}")
-                    base_options = python.BaseOptions(
-                        model_asset_path=str(landmarker_model_path)
-                    )
-                    landmarker_options = mp_vision.FaceLandmarkerOptions(
-                        base_options=base_options,
-                        running_mode=mp_vision.RunningMode.IMAGE,
-                        num_faces=5,  # 支持检测最多5张人脸
+                    
+                    self._landmarker_model_path = landmarker_model_path
+                    self._landmarker_options = dict(
+                        num_faces=self.MAX_LANDMARK_FACES,  # 默认最多5张人脸，需要更多时按需重建
                         min_face_detection_confidence=detection_confidence,
                         min_face_presence_confidence=0.5,
                         min_tracking_confidence=0.5,
                         output_face_blendshapes=True,  # 输出面部表情混合形状
                         output_facial_transformation_matrixes=False
                     )
-                    self.face_landmarker = mp_vision.FaceLandmarker.create_from_options(landmarker_options)
+                    self.face_landmarker = self._create_mediapipe_task(
+                        mp_vision.FaceLandmarker,
+                        mp_vision.FaceLandmarkerOptions,
+                        landmarker_model_path,
+                        running_mode=mp_vision.RunningMode.IMAGE,
+                        **self._landmarker_options
+                    )
                     logger.info(f"✓ Face Landmarker initialized with {landmarker_model_path.name}")
                 else:
                     logger.warning("Face Landmarker model not found, feature disabled")
@@ -220,52 +281,399 @@ class VisionPerceptor:
                 logger.error(f"Face Landmarker initialization failed: {e}")
                 self.use_landmarks = False
         
+        # Face Landmarker 内部已包含人脸检测，可用时直接由特征点得到人脸框，
+        # 不再创建单独的人脸检测器
+        self._faces_from_landmarks = self.use_mediapipe and self.face_landmarker is not None
+        if self._faces_from_landmarks:
+            self.gpu_face_detector = None
+            self.face_detector = None
+            self.mp_face_detection = None
+            self.use_new_api = False
+            logger.info("Face boxes derived from Face Landmarker, standalone detector not created")
+        else:
+            # 初始化GPU人脸检测（OpenCV DNN + CUDA）
+            self.gpu_face_detector = None
+            if self.use_mediapipe and self.use_gpu:
+                self.gpu_face_detector = self._create_gpu_face_detector(detection_confidence)
+            
+            # 初始化MediaPipe人脸检测
+            if self.use_mediapipe:
+                logger.info("Using MediaPipe Face Detection")
+                try:
+                    # 使用MediaPipe的FaceDetection（legacy solution）
+                    mp_face_detection = mp.solutions.face_detection
+                    self.face_detector = mp_face_detection.FaceDetection(
+                        min_detection_confidence=detection_confidence
+                    )
+                    self.mp_face_detection = mp_face_detection
+                except AttributeError:
+                    # 如果solutions不可用，尝试使用新的tasks API
+                    logger.warning("MediaPipe solutions API not available, trying tasks API")
+                    try:
+                        # 尝试使用MediaPipe官方模型 (优先级顺序)
+                        model_candidates = [
+                            MODELS_DIR / 'blaze_face_short_range.tflite',  # Google官方轻量模型
+                            MODELS_DIR / 'MediaPipeFaceDetector.tflite',   # 本地模型
+                            MODELS_DIR / 'face_detection.tflite',          # 通用名称
+                        ]
+                        
+                        model_path = None
+                        for candidate in model_candidates:
+                            if candidate.exists():
+                                model_path = candidate
+                                break
+                        
+                        if model_path is None:
+                            raise FileNotFoundError("No MediaPipe face detection model found. Run download_mediapipe_models.sh")
+                        
+                        logger.info(f"Loading MediaPipe model from: {model_path}")
+                        
+                        self.face_detector = self._create_mediapipe_task(
+                            mp_vision.FaceDetector,
+                            mp_vision.FaceDetectorOptions,
+                            model_path,
+                            min_detection_confidence=detection_confidence,
+                            running_mode=mp_vision.RunningMode.IMAGE
+                        )
+                        self.mp_face_detection = None
+                        self.use_new_api = True
+                        logger.info(f"✓ MediaPipe Face Detector initialized with {model_path.name}")
+                    except Exception as e:
+                        logger.error(f"Failed to initialize MediaPipe: {e}")
+                        logger.info("Falling back to Haar Cascade")
+                        self.use_mediapipe = False
+                        self.face_detector = None
+                        self.use_new_api = False
+            else:
+                logger.info("Using Haar Cascade Face Detection")
+                self.face_detector = None
+                self.use_new_api = False
+        
+        if not self.use_mediapipe:
+            self._haar_cascade = self._load_haar_cascade()
+        
+        # 初始化ONNX / INT8量化情感分类器（可选）
+        self.emotion_classifier = None
+        if use_onnx:
+            try:
+                self.emotion_classifier = OnnxEmotionClassifier(
+                    ONNX_EMOTION_MODEL, use_gpu=self.use_gpu
+                )
+            except Exception as e:
+                logger.warning(f"ONNX emotion model unavailable ({e}), falling back")
+        if quantized and self.emotion_classifier is None:
+            try:
+                self.emotion_classifier = QuantizedEmotionClassifier(QUANTIZED_EMOTION_MODEL)
+            except Exception as e:
+                logger.warning(f"Quantized emotion model unavailable ({e}), falling back to FER")
+        self.quantized = isinstance(self.emotion_classifier, QuantizedEmotionClassifier)
+        
         # 初始化FER情感识别器（不使用其人脸检测功能）
-        try:
-            logger.info("Initializing FER emotion detector")
-            self.emotion_detector = FER(mtcnn=False)
-        except Exception as e:
-            logger.error(f"FER initialization failed: {e}")
-            raise
+        self.emotion_detector = None
+        if self.emotion_classifier is None:
+            try:
+                logger.info("Initializing FER emotion detector")
+                from fer.fer import FER  # 按需导入（依赖TensorFlow，导入较慢）
+                self.emotion_detector = FER(mtcnn=False)
+            except Exception as e:
+                logger.error(f"FER initialization failed: {e}")
+                raise
         
         logger.info(f"Vision perceptor initialized (camera_id={camera_id}, mediapipe={self.use_mediapipe}, landmarks={self.use_landmarks})")
     
+    def _create_mediapipe_task(self, task_cls, options_cls, model_path: Path, **options):
+        """创建MediaPipe任务（人脸检测器 / 特征点检测器）
+        
+        use_gpu 为True时优先使用TFLite GPU委托：支持的算子在GPU上执行，
+        不支持的算子由TFLite自动回退到CPU。GPU委托整体不可用（平台不支持、
+        驱动缺失等）时以CPU委托重新创建。
+        
+        Args:
+            task_cls: 任务类，如 mp_vision.FaceLandmarker
+            options_cls: 对应的选项类，如 mp_vision.FaceLandmarkerOptions
+            model_path: 模型文件路径
+            **options: 传给选项类的其他参数
+        
+        Returns:
+            创建好的任务对象
+        """
+        delegates = [python.BaseOptions.Delegate.CPU]
+        if self.use_gpu:
+            delegates.insert(0, python.BaseOptions.Delegate.GPU)
+        
+        for delegate in delegates:
+            base_options = python.BaseOptions(model_asset_path=str(model_path), delegate=delegate)
+            try:
+                task = task_cls.create_from_options(options_cls(base_options=base_options, **options))
+            except Exception as e:
+                if delegate == delegates[-1]:
+                    raise
+                logger.warning(f"{task_cls.__name__} GPU delegate unavailable ({e}), falling back to CPU")
+                continue
+            logger.info(f"{task_cls.__name__} using {delegate.name} delegate")
+            return task
+    
+    @staticmethod
+    def _create_gpu_face_detector(detection_confidence: float):
+        """创建CUDA后端的YuNet人脸检测器
+        
+        Returns:
+            cv2.FaceDetectorYN 对象；CUDA或模型不可用时返回None
+        """
+        try:
+            cuda_devices = cv2.cuda.getCudaEnabledDeviceCount()
+        except (AttributeError, cv2.error):
+            cuda_devices = 0
+        
+        if cuda_devices <= 0:
+            logger.info("CUDA not available, using CPU face detection")
+            return None
+        
+        if not GPU_FACE_DETECTION_MODEL.exists():
+            logger.warning(f"GPU face detection model not found: {GPU_FACE_DETECTION_MODEL}")
+            logger.info("Download from: https://github.com/opencv/opencv_zoo/raw/main/models/face_detection_yunet/face_detection_yunet_2023mar.onnx")
+            return None
+        
+        try:
+            detector = cv2.FaceDetectorYN.create(
+                str(GPU_FACE_DETECTION_MODEL), "", (320, 320),
+                score_threshold=detection_confidence,
+                nms_threshold=0.3,
+                top_k=5000,
+                backend_id=cv2.dnn.DNN_BACKEND_CUDA,
+                target_id=cv2.dnn.DNN_TARGET_CUDA
+            )
+            logger.info(f"✓ GPU face detector initialized ({cuda_devices} CUDA device(s))")
+            return detector
+        except cv2.error as e:
+            logger.warning(f"GPU face detector initialization failed: {e}")
+            return None
+    
+    @property
+    def detector_name(self) -> str:
+        """当前使用的人脸检测器名称"""
+        if self._faces_from_landmarks:
+            return "mediapipe-landmarker"
+        if self.gpu_face_detector is not None:
+            return "yunet-cuda"
+        return "mediapipe" if self.use_mediapipe else "haar"
+    
     def _open_camera(self):
-        """打开摄像头（延迟初始化）"""
+        """打开摄像头（延迟初始化）
+        
+        Raises:
+            RuntimeError: 感知器为单张图片模式（camera_id < 0），或摄像头无法打开
+        """
+        if self._image_only:
+            raise RuntimeError(
+                f"VisionPerceptor(camera_id={self.camera_id}) has no camera, "
+                "pass a frame to perceive() / perceive_all_faces()"
+            )
         if self.cap is None or not self.cap.isOpened():
             self.cap = cv2.VideoCapture(self.camera_id)
             if not self.cap.isOpened():
                 raise RuntimeError(f"Cannot open camera {self.camera_id}")
+            # 请求MJPG格式：USB摄像头在高分辨率下以MJPG才能达到满帧率，解码开销也更低
+            # （驱动不支持时保持默认格式）
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+            # 驱动内部最多缓存1帧，避免处理积压的旧帧
+            if not self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+                logger.info("Camera backend ignores CAP_PROP_BUFFERSIZE, stale frames will be drained on read")
             logger.info(f"Camera {self.camera_id} opened")
     
-    @staticmethod
-    def _preprocess_frame(frame: np.ndarray) -> np.ndarray:
+    def _read_latest_frame(self) -> Optional[np.ndarray]:
+        """读取摄像头最新的一帧，丢弃缓冲区中积压的旧帧
+        
+        推理慢于摄像头帧率时驱动缓冲区会积压旧帧，直接 read() 处理的是过时画面，
+        延迟不断累积。这里连续 grab()：若很快返回说明取到的是缓冲区中的旧帧，
+        继续抓取；一旦 grab() 需要等待新帧，说明缓冲区已空，解码这一帧。
+        
+        Returns:
+            BGR格式图像，失败时返回None
+        """
+        self._open_camera()
+        
+        dropped = 0
+        while True:
+            start = time.perf_counter()
+            if not self.cap.grab():
+                return None
+            if time.perf_counter() - start > self.STALE_GRAB_THRESHOLD or dropped >= self.MAX_DRAIN_FRAMES:
+                break
+            dropped += 1
+        
+        if dropped:
+            self.dropped_frames += dropped
+            now = time.monotonic()
+            if now - self._drop_log_time >= self.DROP_LOG_INTERVAL:
+                logger.info(f"Dropped {self.dropped_frames - self._drop_log_count} stale frames "
+                            f"since last report (total {self.dropped_frames})")
+                self._drop_log_time = now
+                self._drop_log_count = self.dropped_frames
+        
+        ret, frame = self.cap.retrieve()
+        return frame if ret else None
+    
+    def grab(self) -> bool:
+        """从摄像头抓取下一帧（不解码）
+        
+        与 retrieve() 配合使用：每个周期都 grab() 推进视频流，
+        只在需要处理时才 retrieve() 解码，跳过的帧不产生解码开销。
+        
+        Returns:
+            是否抓取成功
+        """
+        self._open_camera()
+        return self.cap.grab()
+    
+    def retrieve(self) -> Optional[np.ndarray]:
+        """解码最近一次 grab() 抓取的帧
+        
+        Returns:
+            BGR格式图像，失败时返回None
+        """
+        if self.cap is None:
+            return None
+        ret, frame = self.cap.retrieve()
+        return frame if ret else None
+    
+    def _preprocess_frame(self, frame: np.ndarray, reuse_buffer: bool = True) -> np.ndarray:
         """预处理输入帧（MediaPipe最佳实践）
         
         Args:
             frame: BGR格式的输入图像
+            reuse_buffer: 缩放结果是否写入复用的缓冲区（下一帧会覆盖）。
+                流水线中帧会跨线程传递，需传入False
             
         Returns:
             预处理后的图像
             
         优化措施：
-        - 自动调整图像大小（避免过大图像影响性能）
+        - 自动调整图像大小（避免过大图像影响性能），按缩放比例选择插值方式
+        - 缩放输出复用预分配缓冲区，尺寸不变时不再逐帧分配
         - 颜色空间转换准备
         """
         h, w = frame.shape[:2]
         max_dimension = 1280  # MediaPipe推荐的最大尺寸
         
-        if max(h, w) > max_dimension:
+        if h > max_dimension or w > max_dimension:
             scale = max_dimension / max(h, w)
             new_w = int(w * scale)
             new_h = int(h * scale)
-            frame = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_AREA)
+            dst = None
+            if reuse_buffer:
+                if self._resize_dst is None or self._resize_dst.shape != (new_h, new_w) + frame.shape[2:]:
+                    self._resize_dst = np.empty((new_h, new_w) + frame.shape[2:], dtype=frame.dtype)
+                dst = self._resize_dst
+            # 缩小不到一半时 INTER_LINEAR 与 INTER_AREA 对检测效果无明显差别，但快约一倍；
+            # 缩小比例更大时 INTER_LINEAR 会产生混叠，仍使用 INTER_AREA
+            if self.prefer_quality or scale < 0.5:
+                interpolation = cv2.INTER_AREA
+            else:
+                interpolation = cv2.INTER_LINEAR
+            frame = cv2.resize(frame, (new_w, new_h), dst=dst, interpolation=interpolation)
             logger.debug(f"Frame resized from {w}x{h} to {new_w}x{new_h}")
         
         return frame
     
+    def _to_rgb(self, frame: np.ndarray) -> np.ndarray:
+        """将BGR帧转换为RGB（写入复用的缓冲区，尺寸变化时重新分配）
+        
+        每帧只转换一次，结果同时供MediaPipe人脸检测和特征点检测使用。
+        返回的数组在下一帧转换时会被覆盖。
+        """
+        if self._rgb_buf is None or self._rgb_buf.shape != frame.shape:
+            self._rgb_buf = np.empty(frame.shape, dtype=np.uint8)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+    
+    def _to_gray(self, frame: np.ndarray) -> np.ndarray:
+        """将BGR帧转换为灰度（写入复用的缓冲区，尺寸变化时重新分配）
+        
+        返回的数组在下一帧转换时会被覆盖。
+        """
+        h, w = frame.shape[:2]
+        if self._gray_buf is None or self._gray_buf.shape != (h, w):
+            self._gray_buf = np.empty((h, w), dtype=np.uint8)
+        return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray_buf)
+    
+    def _needs_rgb(self) -> bool:
+        """当前帧是否需要RGB图像（MediaPipe人脸检测或特征点检测）"""
+        return (self.use_mediapipe and self.gpu_face_detector is None) or self.use_landmarks
+    
+    def _mediapipe_inputs(self, frame: np.ndarray) -> Tuple[Optional[np.ndarray], Optional["mp.Image"]]:
+        """准备当前帧的MediaPipe输入：RGB图像与 mp.Image 各只构造一次
+        
+        人脸检测（tasks API）与特征点检测共用同一个 mp.Image，
+        legacy solutions API 直接使用RGB数组。
+        
+        Returns:
+            (RGB图像或None, mp.Image或None)
+        """
+        if not self._needs_rgb():
+            return None, None
+        rgb = self._to_rgb(frame)
+        mp_image = None
+        if self.use_landmarks or (self.use_new_api and self.face_detector is not None):
+            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
+        return rgb, mp_image
+    
+    def _detect_faces(
+        self,
+        frame: np.ndarray,
+        rgb: Optional[np.ndarray] = None,
+        mp_image=None
+    ) -> List[Tuple[int, int, int, int]]:
+        """按可用性选择人脸检测器（GPU → MediaPipe → Haar）"""
+        if self.gpu_face_detector is not None:
+            return self._detect_faces_gpu(frame)
+        if self.use_mediapipe:
+            return self._detect_faces_mediapipe(frame, rgb, mp_image)
+        return self._detect_faces_haar(frame)
+    
     @performance_trace
-    def _detect_faces_mediapipe(self, frame: np.ndarray) -> List[Tuple[int, int, int, int]]:
+    def _detect_faces_gpu(self, frame: np.ndarray) -> List[Tuple[int, int, int, int]]:
+        """使用YuNet（OpenCV DNN CUDA后端）检测人脸
+        
+        Args:
+            frame: 输入图像（BGR格式）
+        
+        Returns:
+            人脸框列表 [(x, y, w, h), ...]
+        """
+        h, w = frame.shape[:2]
+        self.gpu_face_detector.setInputSize((w, h))
+        _, detections = self.gpu_face_detector.detect(frame)
+        
+        if detections is None:
+            return []
+        
+        return self._clip_boxes(detections[:, :4].astype(np.int32), w, h)
+    
+    @staticmethod
+    def _clip_boxes(boxes: np.ndarray, w: int, h: int) -> List[Tuple[int, int, int, int]]:
+        """将 (N, 4) 人脸框数组限制在图像范围内
+        
+        Args:
+            boxes: (N, 4) int32 数组，每行为 (x, y, w, h)，原地修改
+            w: 图像宽度
+            h: 图像高度
+        
+        Returns:
+            人脸框列表 [(x, y, w, h), ...]
+        """
+        np.clip(boxes[:, 0], 0, w, out=boxes[:, 0])
+        np.clip(boxes[:, 1], 0, h, out=boxes[:, 1])
+        np.minimum(boxes[:, 2], w - boxes[:, 0], out=boxes[:, 2])
+        np.minimum(boxes[:, 3], h - boxes[:, 1], out=boxes[:, 3])
+        return [tuple(box) for box in boxes.tolist()]
+    
+    @performance_trace
+    def _detect_faces_mediapipe(
+        self,
+        frame: np.ndarray,
+        rgb: Optional[np.ndarray] = None,
+        mp_image=None
+    ) -> List[Tuple[int, int, int, int]]:
         """使用MediaPipe检测人脸（优化版）
         
         采用MediaPipe计算图模式：
@@ -273,59 +681,52 @@ class VisionPerceptor:
         
         Args:
             frame: 输入图像（BGR格式）
+            rgb: 已转换好的RGB图像（可选，未提供时由frame转换）
+            mp_image: 已构造好的 mp.Image（可选，见 _mediapipe_inputs）
         
         Returns:
             人脸框列表 [(x, y, w, h), ...]
         """
         # 转换为RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        rgb_frame = rgb if rgb is not None else self._to_rgb(frame)
+        
+        h, w = frame.shape[:2]
         
         # 检查是使用哪个API
         if hasattr(self, 'use_new_api') and self.use_new_api:
-            # 使用新的tasks API
-            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+            # 使用新的tasks API（像素坐标）
+            if mp_image is None:
+                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
             detection_result = self.face_detector.detect(mp_image)
+            if not detection_result.detections:
+                return []
             
-            faces = []
-            if detection_result.detections:
-                h, w, _ = frame.shape
-                for detection in detection_result.detections:
-                    bbox = detection.bounding_box
-                    x = int(bbox.origin_x)
-                    y = int(bbox.origin_y)
-                    width = int(bbox.width)
-                    height = int(bbox.height)
-                    
-                    # 确保边界在图像范围内
-                    x = max(0, x)
-                    y = max(0, y)
-                    width = min(width, w - x)
-                    height = min(height, h - y)
-                    
-                    faces.append((x, y, width, height))
+            boxes = np.array([
+                (d.bounding_box.origin_x, d.bounding_box.origin_y,
+                 d.bounding_box.width, d.bounding_box.height)
+                for d in detection_result.detections
+            ], dtype=np.float32)
         else:
-            # 使用legacy solutions API
+            # 使用legacy solutions API（归一化坐标）
             results = self.face_detector.process(rgb_frame)
+            if not results.detections:
+                return []
             
-            faces = []
-            if results.detections:
-                h, w, _ = frame.shape
-                for detection in results.detections:
-                    bbox = detection.location_data.relative_bounding_box
-                    x = int(bbox.xmin * w)
-                    y = int(bbox.ymin * h)
-                    width = int(bbox.width * w)
-                    height = int(bbox.height * h)
-                    
-                    # 确保边界在图像范围内
-                    x = max(0, x)
-                    y = max(0, y)
-                    width = min(width, w - x)
-                    height = min(height, h - y)
-                    
-                    faces.append((x, y, width, height))
+            boxes = np.array([
+                (b.xmin, b.ymin, b.width, b.height)
+                for b in (d.location_data.relative_bounding_box for d in results.detections)
+            ], dtype=np.float32)
+            boxes *= np.array([w, h, w, h], dtype=np.float32)
         
-        return faces
+        return self._clip_boxes(boxes.astype(np.int32), w, h)
+    
+    @staticmethod
+    def _load_haar_cascade():
+        """加载Haar Cascade分类器（优先使用本地模型，否则使用OpenCV内置模型）"""
+        cascade_path = MODELS_DIR / "haarcascade_frontalface_default.xml"
+        if not cascade_path.exists():
+            cascade_path = Path(cv2.data.haarcascades) / 'haarcascade_frontalface_default.xml'
+        return cv2.CascadeClassifier(str(cascade_path))
     
     @performance_trace
     def _detect_faces_haar(self, frame: np.ndarray) -> List[Tuple[int, int, int, int]]:
@@ -335,6 +736,8 @@ class VisionPerceptor:
         - scaleFactor: 1.1（平衡速度和准确度）
         - minNeighbors: 4（减少误检）
         - minSize: (30, 30)（过滤小人脸）
+        - 直方图均衡化默认关闭，连续 HAAR_EQUALIZE_MISS_FRAMES 帧未检测到人脸时
+          切换开关（如光照较暗时开启），检测成功后保持当前设置
         
         Args:
             frame: 输入图像（BGR格式）
@@ -342,25 +745,36 @@ class VisionPerceptor:
         Returns:
             人脸框列表 [(x, y, w, h), ...]
         """
-        # 加载Haar Cascade（如果有本地模型）
-        cascade_path = MODELS_DIR / "haarcascade_frontalface_default.xml"
-        if cascade_path.exists():
-            face_cascade = cv2.CascadeClassifier(str(cascade_path))
-        else:
-            # 使用OpenCV内置的
-            face_cascade = cv2.CascadeClassifier(
-                cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
-            )
+        if self._haar_cascade is None:
+            self._haar_cascade = self._load_haar_cascade()
         
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = face_cascade.detectMultiScale(
+        gray = self._to_gray(frame)
+        if self._haar_equalize:
+            cv2.equalizeHist(gray, dst=gray)
+        faces = self._haar_cascade.detectMultiScale(
             gray, scaleFactor=1.1, minNeighbors=5, minSize=(30, 30)
         )
         
+        if len(faces):
+            self._haar_miss_frames = 0
+        else:
+            self._haar_miss_frames += 1
+            if self._haar_miss_frames >= self.HAAR_EQUALIZE_MISS_FRAMES:
+                self._haar_miss_frames = 0
+                self._haar_equalize = not self._haar_equalize
+                logger.debug(f"Haar histogram equalization {'enabled' if self._haar_equalize else 'disabled'}")
+        
         return [(int(x), int(y), int(w), int(h)) for x, y, w, h in faces]
     
     @performance_trace
-    def _analyze_face_landmarks(self, frame: np.ndarray, max_faces: int = 1) -> Optional[List[dict]]:
+    def _analyze_face_landmarks(
+        self,
+        frame: np.ndarray,
+        max_faces: int = 1,
+        rgb: Optional[np.ndarray] = None,
+        video: bool = False,
+        mp_image=None
+    ) -> Optional[List[dict]]:
         """使用MediaPipe FaceLandmarker分析人脸特征点和表情（支持多人脸）
         
         返回每张人脸的468个3D特征点和52个面部表情混合形状（blendshapes）
@@ -368,24 +782,37 @@ class VisionPerceptor:
         Args:
             frame: 输入图像（BGR格式）
             max_faces: 最大检测人脸数（默认1）
+            rgb: 已转换好的RGB图像（可选，未提供时由frame转换）
+            video: 是否为摄像头连续帧。是则使用VIDEO模式的检测器，
+                跟踪成功的帧不再重新运行人脸检测
+            mp_image: 已构造好的 mp.Image（可选，见 _mediapipe_inputs）
         
         Returns:
             人脸数据列表，每个字典包含：
-            - 'landmarks': List of 468 face landmarks (x, y, z)
-            - 'blendshapes': Dict of 52 facial expression coefficients
-            - 'detection_confidence': 检测置信度
+            - 'landmarks': (468, 3) float32 数组，每行为归一化坐标 (x, y, z)
+            - 'landmarks_xy': landmarks 前两列 (x, y) 的 C 连续副本 (468, 2)，供2D绘制和序列化使用
+            - 'blendshapes': (52,) float32 数组，第 i 个为 BLENDSHAPE_NAMES[i] 的系数；
+              模型未输出混合形状时为 None
+            - 'bounding_box': 由特征点范围得到的人脸框 (x, y, w, h)
             如果失败返回 None
         """
         if not self.use_landmarks or self.face_landmarker is None:
             return None
         
+        self._ensure_landmarker_capacity(max_faces)
+        
         try:
             # 转换为RGB（MediaPipe要求）
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+            if mp_image is None:
+                rgb_frame = rgb if rgb is not None else self._to_rgb(frame)
+                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
             
-            # 执行人脸特征点检测
-            result = self.face_landmarker.detect(mp_image)
+            # 执行人脸特征点检测（连续帧使用VIDEO模式跨帧跟踪）
+            video_landmarker = self._get_video_landmarker() if video else None
+            if video_landmarker is not None:
+                result = video_landmarker.detect_for_video(mp_image, self._next_video_timestamp_ms())
+            else:
+                result = self.face_landmarker.detect(mp_image)
             
             if not result.face_landmarks:
                 logger.debug("No face landmarks detected")
@@ -394,31 +821,37 @@ class VisionPerceptor:
             # 处理所有检测到的人脸（最多max_faces个）
             all_faces_data = []
             num_faces = min(len(result.face_landmarks), max_faces)
+            frame_h, frame_w = frame.shape[:2]
             
             for face_idx in range(num_faces):
                 landmarks = result.face_landmarks[face_idx]
                 
-                # 提取特征点坐标
-                landmarks_list = []
-                for landmark in landmarks:
-                    landmarks_list.append({
-                        'x': landmark.x,
-                        'y': landmark.y,
-                        'z': landmark.z if hasattr(landmark, 'z') else 0.0
-                    })
+                # 提取特征点坐标为 (468, 3) float32 数组（归一化坐标 x, y, z）
+                landmarks_array = np.fromiter(
+                    (v for lm in landmarks for v in (lm.x, lm.y, lm.z)),
+                    dtype=np.float32,
+                    count=len(landmarks) * 3
+                ).reshape(-1, 3)
+                bounding_box = self._bbox_from_landmarks(landmarks_array, frame_w, frame_h)
                 
-                # 提取混合形状（blendshapes，表示面部表情）
-                blendshapes_dict = {}
+                # 提取混合形状（blendshapes，表示面部表情），顺序与 BLENDSHAPE_NAMES 一致
+                blendshapes = None
                 if result.face_blendshapes and face_idx < len(result.face_blendshapes):
-                    for category in result.face_blendshapes[face_idx]:
-                        blendshapes_dict[category.category_name] = category.score
+                    categories = result.face_blendshapes[face_idx]
+                    blendshapes = np.fromiter(
+                        (category.score for category in categories),
+                        dtype=np.float32,
+                        count=len(categories)
+                    )
                 
                 all_faces_data.append({
-                    'landmarks': landmarks_list,
-                    'blendshapes': blendshapes_dict,
-                    'num_landmarks': len(landmarks_list),
-                    'num_blendshapes': len(blendshapes_dict),
-                    'face_index': face_idx
+                    'landmarks': landmarks_array,
+                    'landmarks_xy': np.ascontiguousarray(landmarks_array[:, :2]),
+                    'blendshapes': blendshapes,
+                    'num_landmarks': len(landmarks_array),
+                    'num_blendshapes': 0 if blendshapes is None else len(blendshapes),
+                    'face_index': face_idx,
+                    'bounding_box': bounding_box
                 })
             
             return all_faces_data
@@ -427,6 +860,87 @@ class VisionPerceptor:
             logger.error(f"Face landmarks analysis failed: {e}")
             return None
     
+    def _ensure_landmarker_capacity(self, max_faces: int):
+        """请求的人脸数超过特征点检测器的 num_faces 时，以更大的 num_faces 重建检测器
+        
+        人脸框直接由特征点得到时（_faces_from_landmarks），检测器的 num_faces
+        就是可检测的人脸数上限。VIDEO模式的检测器同样作废，下次使用时按新参数创建。
+        重建失败时保留原检测器（最多返回原 num_faces 张人脸）。
+        """
+        if max_faces <= self._landmarker_options['num_faces']:
+            return
+        
+        options = {**self._landmarker_options, 'num_faces': max_faces}
+        try:
+            landmarker = self._create_mediapipe_task(
+                mp_vision.FaceLandmarker,
+                mp_vision.FaceLandmarkerOptions,
+                self._landmarker_model_path,
+                running_mode=mp_vision.RunningMode.IMAGE,
+                **options
+            )
+        except Exception as e:
+            logger.warning(
+                f"Failed to rebuild Face Landmarker for {max_faces} faces ({e}), "
+                f"keeping num_faces={self._landmarker_options['num_faces']}"
+            )
+            return
+        
+        self.face_landmarker.close()
+        self.face_landmarker = landmarker
+        if self.face_landmarker_video is not None:
+            self.face_landmarker_video.close()
+            self.face_landmarker_video = None
+        self._video_landmarker_failed = False
+        self._landmarker_options = options
+        logger.info(f"Face Landmarker rebuilt with num_faces={max_faces}")
+    
+    def _get_video_landmarker(self):
+        """获取VIDEO模式的特征点检测器（首次调用时创建，创建失败则返回None）
+        
+        VIDEO模式在帧间跟踪人脸，跟踪成功时跳过人脸检测子模型。
+        单张图片仍使用IMAGE模式的 face_landmarker。
+        """
+        if self.face_landmarker_video is None and not self._video_landmarker_failed:
+            try:
+                self.face_landmarker_video = self._create_mediapipe_task(
+                    mp_vision.FaceLandmarker,
+                    mp_vision.FaceLandmarkerOptions,
+                    self._landmarker_model_path,
+                    running_mode=mp_vision.RunningMode.VIDEO,
+                    **self._landmarker_options
+                )
+            except Exception as e:
+                logger.warning(f"VIDEO mode Face Landmarker unavailable ({e}), using IMAGE mode")
+                self._video_landmarker_failed = True
+        return self.face_landmarker_video
+    
+    def _next_video_timestamp_ms(self) -> int:
+        """VIDEO模式所需的帧时间戳（毫秒，单调时钟，保证严格递增）"""
+        timestamp_ms = time.monotonic_ns() // 1_000_000
+        if timestamp_ms <= self._last_video_timestamp_ms:
+            timestamp_ms = self._last_video_timestamp_ms + 1
+        self._last_video_timestamp_ms = timestamp_ms
+        return timestamp_ms
+    
+    @staticmethod
+    def _bbox_from_landmarks(landmarks: np.ndarray, frame_w: int, frame_h: int) -> Tuple[int, int, int, int]:
+        """由特征点的最小/最大坐标计算人脸框
+        
+        Args:
+            landmarks: 单张人脸的 (N, 3) 特征点数组（归一化坐标）
+            frame_w: 图像宽度
+            frame_h: 图像高度
+        
+        Returns:
+            人脸框 (x, y, w, h)，已限制在图像范围内
+        """
+        pts = landmarks[:, :2]
+        scale = np.array([frame_w, frame_h], dtype=np.float32)
+        x0, y0 = np.clip(pts.min(axis=0) * scale, 0, scale).astype(np.int32).tolist()
+        x1, y1 = np.clip(pts.max(axis=0) * scale, 0, scale).astype(np.int32).tolist()
+        return (x0, y0, x1 - x0, y1 - y0)
+    
     @performance_trace
     def perceive(self, frame: Optional[np.ndarray] = None) -> Optional[Percept]:
         """感知人脸情感（MediaPipe完整管道）
@@ -441,6 +955,11 @@ class VisionPerceptor:
         7. VAD映射（Emotion → VAD）
         8. Percept构建（Output with landmarks）
         
+        如果已通过 start_pipeline() 启动流水线且未提供 frame，
+        则不阻塞地返回流水线最新的感知结果。
+        如果已通过 start_capture() 启动采集线程，则从采集线程取最新帧，
+        摄像头读取不再阻塞在推理之后。
+        
         Args:
             frame: 可选的输入帧。如果不提供，则从摄像头读取
         
@@ -448,66 +967,114 @@ class VisionPerceptor:
             Percept对象，如果检测失败则返回None
         """
         # Calculator 1: 输入获取
-        if frame is None:
-            self._open_camera()
-            ret, frame = self.cap.read()
-            if not ret:
+        from_camera = frame is None
+        if from_camera:
+            if self._pipeline_threads:
+                return self.get_latest_percept(timeout=0)
+            
+            frame = self._next_camera_frame()
+            if frame is None:
                 logger.warning("Failed to read frame from camera")
                 return None
         
-        # Calculator 2: 帧预处理
-        frame = self._preprocess_frame(frame)
+        # Calculator 2-3.5: 预处理、人脸检测、特征点分析
+        frame, faces, landmarks_data = self._detect_stage(frame, video=from_camera)
+        # 不复制：缩放后的帧可能是复用的缓冲区，需要保留时由调用方在下一次 perceive() 前自行复制
+        self.last_frame = frame
+        if not faces:
+            return None
+        
+        # Calculator 4-7: 情感分析并构建Percept
+        return self._emotion_stage(frame, faces, landmarks_data)
+    
+    def _detect_stage(
+        self,
+        frame: np.ndarray,
+        reuse_buffer: bool = True,
+        video: bool = False
+    ) -> Tuple[np.ndarray, List[Tuple[int, int, int, int]], Optional[dict]]:
+        """检测阶段：帧预处理 + 人脸检测 + 主要人脸的特征点分析
+        
+        Args:
+            frame: 输入图像（BGR格式）
+            reuse_buffer: 预处理缩放是否复用缓冲区（见 _preprocess_frame）
+            video: 是否为摄像头连续帧（见 _analyze_face_landmarks）
+        
+        Returns:
+            (预处理后的帧, 人脸框列表, 主要人脸的特征点数据或None)
+        """
+        # Calculator 2: 帧预处理（RGB转换与 mp.Image 构造只做一次，检测与特征点共用）
+        frame = self._preprocess_frame(frame, reuse_buffer)
+        rgb, mp_image = self._mediapipe_inputs(frame)
+        
+        # Calculator 3 + 3.5: Face Landmarker 同时给出人脸框和特征点
+        if self._faces_from_landmarks:
+            all_landmarks = self._analyze_face_landmarks(
+                frame, self.MAX_LANDMARK_FACES, rgb, video, mp_image
+            )
+            if not all_landmarks:
+                logger.debug("No faces detected")
+                return frame, [], None
+            faces = [face_data['bounding_box'] for face_data in all_landmarks]
+            return frame, faces, all_landmarks[0]
         
         # Calculator 3: 人脸检测
-        if self.use_mediapipe:
-            faces = self._detect_faces_mediapipe(frame)
-        else:
-            faces = self._detect_faces_haar(frame)
+        faces = self._detect_faces(frame, rgb, mp_image)
         
         if not faces:
             logger.debug("No faces detected")
-            return None
-        
-        # 取第一张脸（主要人脸）
-        x, y, w, h = faces[0]
+            return frame, [], None
         
         # Calculator 3.5: 人脸特征点和表情分析（MediaPipe FaceLandmarker）
         landmarks_data = None
         if self.use_landmarks:
-            all_landmarks = self._analyze_face_landmarks(frame, max_faces=1)
+            all_landmarks = self._analyze_face_landmarks(frame, 1, rgb, video, mp_image)
             if all_landmarks and len(all_landmarks) > 0:
                 landmarks_data = all_landmarks[0]  # 只取第一张脸
                 logger.debug(f"Detected {landmarks_data['num_landmarks']} landmarks, {landmarks_data['num_blendshapes']} blendshapes")
         
+        return frame, faces, landmarks_data
+    
+    def _emotion_stage(
+        self,
+        frame: np.ndarray,
+        faces: List[Tuple[int, int, int, int]],
+        landmarks_data: Optional[dict]
+    ) -> Optional[Percept]:
+        """情感阶段：裁剪主要人脸 + FER情感分析 + VAD映射 + 构建Percept
+        
+        Args:
+            frame: 预处理后的图像（BGR格式）
+            faces: 人脸框列表（取第一张脸）
+            landmarks_data: 主要人脸的特征点数据（可选）
+        
+        Returns:
+            Percept对象，如果分析失败则返回None
+        """
+        # 取第一张脸（主要人脸）
+        x, y, w, h = faces[0]
+        
         # Calculator 4: 裁剪人脸区域
         face_img = frame[y:y+h, x:x+w]
         
-        # Calculator 5: 使用FER分析情感
+        # Calculator 5: 分析情感（量化模型或FER）
         try:
-            emotions_list = self.emotion_detector.detect_emotions(face_img)
+            emotions = self._classify_emotions(face_img)
         except Exception as e:
             logger.error(f"Emotion detection failed: {e}")
             return None
         
-        # 如果FER没有检测到情感（但MediaPipe检测到了人脸）
-        if not emotions_list:
-            logger.debug("FER could not detect emotions in face region")
-            # 尝试在全图上检测
-            try:
-                emotions_list = self.emotion_detector.detect_emotions(frame)
-            except:
-                return None
-            
-            if not emotions_list:
-                return None
-        
-        # 取第一个结果
-        face_data = emotions_list[0]
-        emotions = face_data['emotions']
+        # 如果FER没有检测到情感（但MediaPipe检测到了人脸），跳过这一帧
+        # （不在全图上重试：整帧重新检测的开销远大于裁剪区域，且很少成功）
+        if emotions is None:
+            self.emotion_skipped_frames += 1
+            logger.debug(f"FER could not detect emotions in face region "
+                         f"(skipped {self.emotion_skipped_frames} frames)")
+            return None
         
         # 找到主导情感
-        dominant_emotion = max(emotions, key=emotions.get)
-        confidence = emotions[dominant_emotion]
+        idx, confidence = _dominant_emotion_index(emotions)
+        dominant_emotion = EMOTION_ORDER[idx]
         
         # 如果置信度太低，忽略
         if confidence < self.min_confidence:
@@ -515,10 +1082,7 @@ class VisionPerceptor:
             return None
         
         # Calculator 6: 映射到VAD空间
-        v, a, d = self.EMOTION_TO_VAD.get(
-            dominant_emotion,
-            (0.0, 0.5, 0.0)  # 默认中性
-        )
+        v, a, d = _EMOTION_VADS[idx]
         
         # Calculator 7: 创建Percept对象（包含特征点和表情数据）
         metadata = {
@@ -526,12 +1090,13 @@ class VisionPerceptor:
             "all_emotions": emotions,
             "bounding_box": [x, y, w, h],
             "num_faces": len(faces),
-            "detector": "mediapipe" if self.use_mediapipe else "haar"
+            "detector": self.detector_name
         }
         
         # 添加特征点和混合形状数据
         if landmarks_data:
             metadata["face_landmarks"] = landmarks_data['landmarks']
+            metadata["face_landmarks_xy"] = landmarks_data['landmarks_xy']
             metadata["face_blendshapes"] = landmarks_data['blendshapes']
             metadata["num_landmarks"] = landmarks_data['num_landmarks']
             metadata["num_blendshapes"] = landmarks_data['num_blendshapes']
@@ -548,6 +1113,263 @@ class VisionPerceptor:
         logger.debug(f"Detected emotion: {dominant_emotion} (conf: {confidence:.2f})")
         return percept
     
+    def _classify_emotions(self, face_img: np.ndarray) -> Optional[dict]:
+        """对人脸裁剪图像进行情感分类
+        
+        Args:
+            face_img: 人脸区域图像（BGR格式）
+        
+        Returns:
+            情感概率字典；FER在裁剪区域内未找到人脸时返回None
+        """
+        if self.emotion_classifier is not None:
+            return self.emotion_classifier.predict(face_img)
+        
+        emotions_list = self.emotion_detector.detect_emotions(face_img)
+        # 裁剪区域过小时FER内部的人脸检测容易失败，放大到模型输入尺寸后重试一次
+        if not emotions_list and min(face_img.shape[:2]) < self.FER_MIN_FACE_SIZE:
+            face_img = cv2.resize(face_img, FER_INPUT_SIZE, interpolation=cv2.INTER_LINEAR)
+            emotions_list = self.emotion_detector.detect_emotions(face_img)
+        if not emotions_list:
+            return None
+        return emotions_list[0]['emotions']
+    
+    def _crop_faces_batch(
+        self,
+        frame: np.ndarray,
+        faces: List[Tuple[int, int, int, int]]
+    ) -> np.ndarray:
+        """将所有人脸区域裁剪并缩放到模型输入尺寸，写入一个连续的灰度批次
+        
+        整帧只做一次灰度转换，各人脸直接缩放写入批次缓冲区的对应行。
+        返回的数组在下一次调用时会被覆盖。
+        
+        Args:
+            frame: 输入图像（BGR格式）
+            faces: 人脸框列表 [(x, y, w, h), ...]
+        
+        Returns:
+            (N, 64, 64) uint8 数组，第 i 行对应 faces[i]
+        """
+        n = len(faces)
+        if self._face_batch is None or len(self._face_batch) < n:
+            self._face_batch = np.empty((n, *FER_INPUT_SIZE[::-1]), dtype=np.uint8)
+        batch = self._face_batch[:n]
+        
+        gray = self._to_gray(frame)
+        for i, (x, y, w, h) in enumerate(faces):
+            cv2.resize(gray[y:y+h, x:x+w], FER_INPUT_SIZE, dst=batch[i])
+        return batch
+    
+    def _classify_emotions_batch(
+        self,
+        face_imgs: Union[List[np.ndarray], np.ndarray]
+    ) -> List[Optional[dict]]:
+        """对多张人脸裁剪图像进行情感分类
+        
+        分类器支持批量推理（ONNX）时一次前向推理完成，否则逐张分类。
+        
+        Args:
+            face_imgs: 人脸区域图像列表（BGR格式），或 _crop_faces_batch()
+                生成的 (N, 64, 64) 灰度批次
+        
+        Returns:
+            与输入顺序一致的情感概率字典列表，分类失败的人脸为None
+        """
+        if hasattr(self.emotion_classifier, 'predict_batch'):
+            try:
+                return self.emotion_classifier.predict_batch(face_imgs)
+            except Exception as e:
+                logger.error(f"Batch emotion detection failed: {e}")
+                return [None] * len(face_imgs)
+        
+        results = []
+        for face_idx, face_img in enumerate(face_imgs):
+            try:
+                results.append(self._classify_emotions(face_img))
+            except Exception as e:
+                logger.error(f"Emotion detection failed for face {face_idx}: {e}")
+                results.append(None)
+        return results
+    
+    def start_capture(self):
+        """仅启动采集线程，同步调用 perceive() / perceive_all_faces() 时取用最新帧
+        
+        采集线程持续读取摄像头并只保留最新一帧（容量为1的队列，满时丢弃旧帧），
+        推理在调用方线程中进行。采集帧率不再受推理耗时限制，
+        每次推理拿到的都是最新画面。需要完整的三线程流水线时使用 start_pipeline()。
+        """
+        if self._pipeline_threads or self._capture_thread is not None:
+            return
+        
+        self._open_camera()
+        self._pipeline_stop.clear()
+        self._frame_queue = queue.Queue(maxsize=1)
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop, args=(True,), name="vision-capture", daemon=True
+        )
+        self._capture_thread.start()
+        logger.info("Vision capture thread started")
+    
+    def stop_capture(self):
+        """停止采集线程并等待其退出"""
+        if self._capture_thread is None:
+            return
+        
+        self._pipeline_stop.set()
+        self._capture_thread.join(timeout=1.0)
+        self._capture_thread = None
+        logger.info("Vision capture thread stopped")
+    
+    def _next_camera_frame(self, timeout: float = 1.0) -> Optional[np.ndarray]:
+        """获取下一帧摄像头图像（采集线程运行时从中取最新帧，否则直接读取）"""
+        if self._capture_thread is not None:
+            try:
+                return self._frame_queue.get(timeout=timeout)
+            except queue.Empty:
+                return None
+        return self._read_latest_frame()
+    
+    def start_pipeline(self):
+        """启动摄像头流水线（采集 → 人脸检测 → 情感分析）
+        
+        三个阶段分别运行在独立的守护线程中，通过容量为1的队列连接。
+        队列满时丢弃旧数据，消费者总是拿到最新的帧，采集线程不会被阻塞。
+        吞吐量由最慢的阶段决定，而不是三个阶段耗时之和。
+        
+        启动后调用 perceive()（不传frame）或 get_latest_percept() 获取结果。
+        流水线运行期间不要再传入frame调用 perceive()，检测器不支持并发调用。
+        """
+        if self._pipeline_threads:
+            return
+        
+        self.stop_capture()
+        self._open_camera()
+        self._pipeline_stop.clear()
+        self._frame_queue = queue.Queue(maxsize=1)
+        self._face_queue = queue.Queue(maxsize=1)
+        self._percept_queue = queue.Queue(maxsize=1)
+        self._latest_percept = None
+        self.last_frame = None
+        
+        self._pipeline_threads = [
+            threading.Thread(target=self._capture_loop, name="vision-capture", daemon=True),
+            threading.Thread(target=self._detect_loop, name="vision-detect", daemon=True),
+            threading.Thread(target=self._emotion_loop, name="vision-emotion", daemon=True),
+        ]
+        for thread in self._pipeline_threads:
+            thread.start()
+        logger.info("Vision pipeline started")
+    
+    def stop_pipeline(self):
+        """停止摄像头流水线并等待线程退出"""
+        if not self._pipeline_threads:
+            return
+        
+        self._pipeline_stop.set()
+        for thread in self._pipeline_threads:
+            thread.join(timeout=1.0)
+        self._pipeline_threads = []
+        logger.info("Vision pipeline stopped")
+    
+    def get_latest_percept(self, timeout: Optional[float] = None) -> Optional[Percept]:
+        """获取流水线最新的感知结果
+        
+        Args:
+            timeout: 等待新结果的最长时间（秒）。0表示不等待，None表示一直等待
+        
+        Returns:
+            最新的Percept；超时没有新结果时返回上一次的结果
+        """
+        return self.get_latest_result(timeout)[1]
+    
+    def get_latest_result(
+        self,
+        timeout: Optional[float] = None
+    ) -> Tuple[Optional[np.ndarray], Optional[Percept]]:
+        """获取流水线最新的 (帧, 感知结果)
+        
+        帧与Percept来自同一个队列元素，保证人脸框等标注画在对应的帧上；
+        last_frame 也随之更新。
+        
+        Args:
+            timeout: 等待新结果的最长时间（秒）。0表示不等待，None表示一直等待
+        
+        Returns:
+            (预处理后的帧, Percept)；超时没有新结果时返回上一次的结果
+        """
+        try:
+            self.last_frame, self._latest_percept = self._percept_queue.get(timeout=timeout)
+        except queue.Empty:
+            pass
+        return self.last_frame, self._latest_percept
+    
+    @staticmethod
+    def _put_latest(q: queue.Queue, item):
+        """放入队列，队列已满时先丢弃最旧的元素"""
+        while True:
+            try:
+                q.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    pass
+    
+    def _capture_loop(self, decode_every_frame: bool = False):
+        """采集线程：持续 grab()，仅在检测阶段取走上一帧后才 retrieve() 解码
+        
+        Args:
+            decode_every_frame: 是否解码每一帧并替换队列中未取走的旧帧。
+                仅采集模式下推理间隔不确定，需保证取到的总是最新帧
+        """
+        while not self._pipeline_stop.is_set():
+            if not self.cap.grab():
+                logger.warning("Failed to grab frame from camera")
+                time.sleep(0.01)
+                continue
+            
+            if not decode_every_frame and not self._frame_queue.empty():
+                continue  # 检测阶段仍忙，跳过该帧的解码
+            
+            ret, frame = self.cap.retrieve()
+            if ret:
+                self._put_latest(self._frame_queue, frame)
+    
+    def _detect_loop(self):
+        """检测线程：预处理 + 人脸检测 + 特征点分析"""
+        while not self._pipeline_stop.is_set():
+            try:
+                frame = self._frame_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            
+            try:
+                # 预处理后的帧会传给情感线程，不能复用缓冲区
+                result = self._detect_stage(frame, reuse_buffer=False, video=True)
+            except Exception as e:
+                logger.error(f"Detection stage failed: {e}")
+                continue
+            self._put_latest(self._face_queue, result)
+    
+    def _emotion_loop(self):
+        """情感线程：FER情感分析，输出Percept（未检测到人脸时输出None）"""
+        while not self._pipeline_stop.is_set():
+            try:
+                frame, faces, landmarks_data = self._face_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            
+            percept = None
+            if faces:
+                try:
+                    percept = self._emotion_stage(frame, faces, landmarks_data)
+                except Exception as e:
+                    logger.error(f"Emotion stage failed: {e}")
+            # 帧与结果放在同一个队列元素中，取出时不会错位
+            self._put_latest(self._percept_queue, (frame, percept))
+    
     @performance_trace
     def perceive_all_faces(self, frame: Optional[np.ndarray] = None, max_faces: int = 5) -> List[Optional[Percept]]:
         """感知所有人脸的情感（多人脸版本）
@@ -557,7 +1379,7 @@ class VisionPerceptor:
         2. 帧预处理（Resize/Normalize）
         3. 人脸检测（MediaPipe/Haar）- 检测所有人脸
         4. 人脸特征点检测（所有人脸的468 landmarks + 52 blendshapes）
-        5. 逐个分析每张人脸的情感
+        5. 批量分析所有人脸的情感（ONNX模型一次前向推理）
         6. 返回所有人脸的Percept列表
         
         Args:
@@ -566,64 +1388,77 @@ class VisionPerceptor:
         
         Returns:
             Percept对象列表，每个对象对应一张人脸
+        
+        Raises:
+            RuntimeError: 流水线运行期间未提供 frame（摄像头由采集线程独占，
+                检测器也不支持与检测线程并发调用）
         """
         # Calculator 1: 输入获取
-        if frame is None:
-            self._open_camera()
-            ret, frame = self.cap.read()
-            if not ret:
+        from_camera = frame is None
+        if from_camera:
+            if self._pipeline_threads:
+                raise RuntimeError(
+                    "perceive_all_faces() cannot read the camera while the pipeline is running; "
+                    "call stop_pipeline() first or use start_capture()"
+                )
+            frame = self._next_camera_frame()
+            if frame is None:
                 logger.warning("Failed to read frame from camera")
                 return []
         
-        # Calculator 2: 帧预处理
+        # Calculator 2: 帧预处理（RGB转换与 mp.Image 构造只做一次，检测与特征点共用）
         frame = self._preprocess_frame(frame)
+        rgb, mp_image = self._mediapipe_inputs(frame)
         
-        # Calculator 3: 人脸检测（检测所有人脸）
-        if self.use_mediapipe:
-            faces = self._detect_faces_mediapipe(frame)
+        # Calculator 3 + 3.5: Face Landmarker 同时给出人脸框和特征点
+        if self._faces_from_landmarks:
+            all_landmarks_data = self._analyze_face_landmarks(
+                frame, max_faces, rgb, from_camera, mp_image
+            )
+            faces = [face_data['bounding_box'] for face_data in all_landmarks_data or []]
         else:
-            faces = self._detect_faces_haar(frame)
+            # Calculator 3: 人脸检测（检测所有人脸）
+            faces = self._detect_faces(frame, rgb, mp_image)[:max_faces]
+            all_landmarks_data = None
         
         if not faces:
             logger.debug("No faces detected")
             return []
         
-        # 限制检测人脸数
-        faces = faces[:max_faces]
         logger.info(f"Detected {len(faces)} faces")
         
         # Calculator 3.5: 获取所有人脸的特征点和表情（批量）
-        all_landmarks_data = None
-        if self.use_landmarks:
-            all_landmarks_data = self._analyze_face_landmarks(frame, max_faces=len(faces))
+        if self.use_landmarks and not self._faces_from_landmarks:
+            all_landmarks_data = self._analyze_face_landmarks(
+                frame, len(faces), rgb, from_camera, mp_image
+            )
         
-        # Calculator 4-7: 逐个处理每张人脸
+        # Calculator 4-5: 裁剪所有人脸区域并批量分析情感
+        # （分类器直接接收模型输入尺寸的灰度批次；FER库需要原始彩色裁剪区域）
+        # 贴着画面边缘的人脸框裁剪后可能宽或高为0，跳过这些人脸，结果记为None
+        valid_idx = [i for i, (_, _, w, h) in enumerate(faces) if w > 0 and h > 0]
+        valid_faces = [faces[i] for i in valid_idx]
+        all_emotions: List[Optional[dict]] = [None] * len(faces)
+        if valid_faces:
+            if self.emotion_classifier is not None:
+                face_imgs = self._crop_faces_batch(frame, valid_faces)
+            else:
+                face_imgs = [frame[y:y+h, x:x+w] for x, y, w, h in valid_faces]
+            for i, emotions in zip(valid_idx, self._classify_emotions_batch(face_imgs)):
+                all_emotions[i] = emotions
+        
+        # Calculator 6-7: 逐个构建每张人脸的Percept
         percepts = []
-        for face_idx, (x, y, w, h) in enumerate(faces):
-            # 裁剪人脸区域
-            face_img = frame[y:y+h, x:x+w]
-            
-            # 使用FER分析情感
-            try:
-                emotions_list = self.emotion_detector.detect_emotions(face_img)
-            except Exception as e:
-                logger.error(f"Emotion detection failed for face {face_idx}: {e}")
-                percepts.append(None)
-                continue
-            
+        for face_idx, ((x, y, w, h), emotions) in enumerate(zip(faces, all_emotions)):
             # 如果FER没有检测到情感
-            if not emotions_list:
+            if emotions is None:
                 logger.debug(f"FER could not detect emotions for face {face_idx}")
                 percepts.append(None)
                 continue
             
-            # 取第一个结果
-            face_data = emotions_list[0]
-            emotions = face_data['emotions']
-            
             # 找到主导情感
-            dominant_emotion = max(emotions, key=emotions.get)
-            confidence = emotions[dominant_emotion]
+            idx, confidence = _dominant_emotion_index(emotions)
+            dominant_emotion = EMOTION_ORDER[idx]
             
             # 如果置信度太低，忽略
             if confidence < self.min_confidence:
@@ -632,10 +1467,7 @@ class VisionPerceptor:
                 continue
             
             # 映射到VAD空间
-            v, a, d = self.EMOTION_TO_VAD.get(
-                dominant_emotion,
-                (0.0, 0.5, 0.0)  # 默认中性
-            )
+            v, a, d = _EMOTION_VADS[idx]
             
             # 创建Percept对象（包含特征点和表情数据）
             metadata = {
@@ -644,13 +1476,14 @@ class VisionPerceptor:
                 "bounding_box": [x, y, w, h],
                 "face_index": face_idx,
                 "total_faces": len(faces),
-                "detector": "mediapipe" if self.use_mediapipe else "haar"
+                "detector": self.detector_name
             }
             
             # 添加特征点和混合形状数据（如果有）
             if all_landmarks_data and face_idx < len(all_landmarks_data):
                 landmarks_data = all_landmarks_data[face_idx]
                 metadata["face_landmarks"] = landmarks_data['landmarks']
+                metadata["face_landmarks_xy"] = landmarks_data['landmarks_xy']
                 metadata["face_blendshapes"] = landmarks_data['blendshapes']
                 metadata["num_landmarks"] = landmarks_data['num_landmarks']
                 metadata["num_blendshapes"] = landmarks_data['num_blendshapes']
@@ -719,6 +1552,8 @@ class VisionPerceptor:
     
     def release(self):
         """释放摄像头资源"""
+        self.stop_pipeline()
+        self.stop_capture()
         if self.cap is not None:
             self.cap.release()
             self.cap = None
@@ -738,10 +1573,115 @@ class VisionPerceptor:
         self.release()
 
 
-# 便捷函数：快速从图片检测情感
+def blendshapes_as_dict(blendshapes: np.ndarray) -> Dict[str, float]:
+    """将混合形状数组转换为 {名称: 系数} 字典（兼容旧格式的使用方）
+    
+    Args:
+        blendshapes: metadata['face_blendshapes'] 中的 (52,) 数组
+    
+    Returns:
+        以 BLENDSHAPE_NAMES 为键的字典
+    """
+    return dict(zip(BLENDSHAPE_NAMES, blendshapes.tolist()))
+
+
+def landmarks_as_dicts(landmarks: np.ndarray) -> List[dict]:
+    """将 (N, 3) 特征点数组转换为字典列表（兼容旧格式的使用方）
+    
+    Args:
+        landmarks: Percept.metadata['face_landmarks'] 中的特征点数组
+    
+    Returns:
+        [{'x': ..., 'y': ..., 'z': ...}, ...]
+    """
+    return [{'x': x, 'y': y, 'z': z} for x, y, z in landmarks.tolist()]
+
+
+# 特征点标记的像素偏移（十字形，与半径为1的实心圆点外观相近）
+_POINT_OFFSETS = np.array([(0, 0), (1, 0), (-1, 0), (0, 1), (0, -1)], dtype=np.int32)
+
+
+def _landmarks_to_pixels(landmarks_xy: np.ndarray, w: int, h: int) -> np.ndarray:
+    """将 (N, 2) 归一化特征点坐标转换为 int32 像素坐标
+    
+    乘法结果直接写入 int32 输出数组（截断取整，与 astype(np.int32) 相同），
+    不产生中间的浮点数组。
+    """
+    pixels = np.empty(landmarks_xy.shape, dtype=np.int32)
+    np.multiply(landmarks_xy, (w, h), out=pixels, casting='unsafe')
+    return pixels
+
+
+def _draw_points(image: np.ndarray, points: np.ndarray, color) -> None:
+    """在图像上批量绘制点标记（一次索引赋值，代替逐点调用 cv2.circle）
+    
+    Args:
+        image: 要绘制的图像（BGR格式），原地修改
+        points: (N, 2) int32 像素坐标 (x, y)
+        color: BGR颜色，或与 points 逐行对应的 (N, 3) 颜色数组
+    """
+    h, w = image.shape[:2]
+    pts = (points[:, None, :] + _POINT_OFFSETS).reshape(-1, 2)
+    colors = np.asarray(color, dtype=np.uint8)
+    if colors.ndim == 2:
+        colors = np.repeat(colors, len(_POINT_OFFSETS), axis=0)
+    
+    # 丢弃超出图像范围的像素
+    inside = (pts[:, 0] >= 0) & (pts[:, 0] < w) & (pts[:, 1] >= 0) & (pts[:, 1] < h)
+    pts = pts[inside]
+    if colors.ndim == 2:
+        colors = colors[inside]
+    image[pts[:, 1], pts[:, 0]] = colors
+
+
+# 便捷函数：处理单张图片的感知器缓存（按构造参数区分），见 _get_perceptor()
+# 模型初始化耗时远大于单张图片的推理，跨调用复用以摊销初始化开销
+_PERCEPTORS: Dict[tuple, VisionPerceptor] = {}
+# 缓存的感知器持有可复用的缓冲区（缩放输出、人脸裁剪批次），不能被多个线程同时使用；
+# 取用感知器并完成推理的整个过程都需持有此锁
+_PERCEPTORS_LOCK = threading.Lock()
+_PERCEPTOR_SIGNATURE = inspect.signature(VisionPerceptor)
+
+
+def _get_perceptor(**kwargs) -> VisionPerceptor:
+    """获取处理单张图片用的感知器（不打开摄像头），调用方需持有 _PERCEPTORS_LOCK
+    
+    相同参数的感知器只在首次调用时创建，之后直接复用，
+    不必为每张图片重新加载MediaPipe和情感分类模型。
+    缓存键使用补全默认值后的参数，并按MediaPipe是否可用解析
+    use_mediapipe / use_landmarks，等价的调用共用同一个感知器。
+    
+    Args:
+        **kwargs: 传给 VisionPerceptor 的构造参数（camera_id 固定为 -1）
+    """
+    bound = _PERCEPTOR_SIGNATURE.bind(camera_id=-1, **kwargs)
+    bound.apply_defaults()
+    params = bound.arguments
+    params['use_mediapipe'] = bool(params['use_mediapipe']) and MEDIAPIPE_AVAILABLE
+    params['use_landmarks'] = bool(params['use_landmarks']) and MEDIAPIPE_AVAILABLE
+    
+    key = tuple(sorted(params.items()))
+    vp = _PERCEPTORS.get(key)
+    if vp is None:
+        vp = VisionPerceptor(**params)
+        _PERCEPTORS[key] = vp
+    return vp
+
+
+def close_perceptors():
+    """释放 detect_emotion_from_image / visualize_* 缓存的所有感知器"""
+    with _PERCEPTORS_LOCK:
+        for vp in _PERCEPTORS.values():
+            vp.release()
+        _PERCEPTORS.clear()
+
+
 def detect_emotion_from_image(image_path: str, use_mediapipe: bool = True) -> Optional[Percept]:
     """从图片快速检测情感（无需创建对象）
     
+    首次调用时创建感知器并缓存，之后的调用直接复用（不打开摄像头），
+    不再需要时调用 close_perceptors() 释放。多个线程同时调用时依次执行。
+    
     Args:
         image_path: 图片文件路径
         use_mediapipe: 是否使用MediaPipe人脸检测（默认True）
@@ -754,7 +1694,8 @@ def detect_emotion_from_image(image_path: str, use_mediapipe: bool = True) -> Op
         if percept:
             print(f"情感: V={percept.valence_hint:.2f}")
     """
-    with VisionPerceptor(camera_id=-1, use_mediapipe=use_mediapipe) as vp:  # 不打开摄像头
+    with _PERCEPTORS_LOCK:
+        vp = _get_perceptor(use_mediapipe=use_mediapipe)
         return vp.perceive_from_image(image_path)
 
 
@@ -787,91 +1728,93 @@ def visualize_face_analysis(
     h, w = image.shape[:2]
     
     # 使用VisionPerceptor进行分析
-    with VisionPerceptor(camera_id=-1, use_mediapipe=True, use_landmarks=True) as vp:
+    with _PERCEPTORS_LOCK:
+        vp = _get_perceptor(use_mediapipe=True, use_landmarks=True)
         percept = vp.perceive(image)
+    
+    if percept is None or 'face_landmarks' not in percept.metadata:
+        logger.warning("未检测到人脸特征点")
+        return image
+    
+    # 绘制人脸边界框
+    if 'bounding_box' in percept.metadata:
+        x, y, fw, fh = percept.metadata['bounding_box']
+        cv2.rectangle(image, (x, y), (x+fw, y+fh), (0, 255, 0), 2)
+    
+    # 绘制468个人脸特征点
+    if show_landmarks and 'face_landmarks_xy' in percept.metadata:
+        landmarks = percept.metadata['face_landmarks_xy']
+        # 转换归一化坐标到像素坐标，一次绘制所有小圆点
+        points = _landmarks_to_pixels(landmarks, w, h)
+        _draw_points(image, points, (0, 255, 255))
+        
+        logger.info(f"绘制了 {len(landmarks)} 个人脸特征点")
+    
+    # 显示混合形状（面部表情系数）
+    if show_blendshapes and percept.metadata.get('face_blendshapes') is not None:
+        blendshapes = percept.metadata['face_blendshapes']
+        
+        # 选择前10个最显著的混合形状
+        top = np.argsort(blendshapes)[::-1][:10]
+        sorted_blendshapes = [
+            (BLENDSHAPE_NAMES[i], score)
+            for i, score in zip(top.tolist(), blendshapes[top].tolist())
+        ]
         
-        if percept is None or 'face_landmarks' not in percept.metadata:
-            logger.warning("未检测到人脸特征点")
-            return image
+        # 在图像右侧创建信息面板：预先分配合并后的画布，
+        # 面板直接绘制在画布右侧的视图上，不再用 np.hstack 拼接
+        panel_width = 400
+        # 左侧由原图覆盖，只需把面板区域填充为黑色背景
+        canvas = np.empty((h, w + panel_width, 3), dtype=np.uint8)
+        canvas[:, :w] = image
+        panel = canvas[:, w:]
+        panel.fill(0)
         
-        # 绘制人脸边界框
-        if 'bounding_box' in percept.metadata:
-            x, y, fw, fh = percept.metadata['bounding_box']
-            cv2.rectangle(image, (x, y), (x+fw, y+fh), (0, 255, 0), 2)
-        
-        # 绘制468个人脸特征点
-        if show_landmarks and 'face_landmarks' in percept.metadata:
-            landmarks = percept.metadata['face_landmarks']
-            for landmark in landmarks:
-                # 转换归一化坐标到像素坐标
-                px = int(landmark['x'] * w)
-                py = int(landmark['y'] * h)
-                # 绘制小圆点
-                cv2.circle(image, (px, py), 1, (0, 255, 255), -1)
-            
-            logger.info(f"绘制了 {len(landmarks)} 个人脸特征点")
+        # 标题
+        cv2.putText(
+            panel, "Top 10 Blendshapes", (10, 30),
+            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2
+        )
         
-        # 显示混合形状（面部表情系数）
-        if show_blendshapes and 'face_blendshapes' in percept.metadata:
-            blendshapes = percept.metadata['face_blendshapes']
-            
-            # 选择前10个最显著的混合形状
-            sorted_blendshapes = sorted(
-                blendshapes.items(),
-                key=lambda x: x[1],
-                reverse=True
-            )[:10]
+        # 显示混合形状
+        y_offset = 60
+        for name, score in sorted_blendshapes:
+            # 缩短名称
+            display_name = name.replace('_', ' ').title()[:25]
+            text = f"{display_name}: {score:.3f}"
             
-            # 在图像右侧创建信息面板
-            panel_width = 400
-            panel = np.zeros((h, panel_width, 3), dtype=np.uint8)
-            
-            # 标题
             cv2.putText(
-                panel, "Top 10 Blendshapes", (10, 30),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2
+                panel, text, (10, y_offset),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1
             )
             
-            # 显示混合形状
-            y_offset = 60
-            for name, score in sorted_blendshapes:
-                # 缩短名称
-                display_name = name.replace('_', ' ').title()[:25]
-                text = f"{display_name}: {score:.3f}"
-                
-                cv2.putText(
-                    panel, text, (10, y_offset),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1
-                )
-                
-                # 绘制进度条
-                bar_length = int(score * 350)
-                cv2.rectangle(
-                    panel,
-                    (10, y_offset + 5),
-                    (10 + bar_length, y_offset + 15),
-                    (0, 255, 0), -1
-                )
-                
-                y_offset += 35
-            
-            # 显示主导情感
-            emotion_text = f"Emotion: {percept.metadata['dominant_emotion'].upper()}"
-            confidence_text = f"Confidence: {percept.confidence:.1%}"
-            
-            cv2.putText(
-                panel, emotion_text, (10, y_offset + 30),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2
+            # 绘制进度条
+            bar_length = int(score * 350)
+            cv2.rectangle(
+                panel,
+                (10, y_offset + 5),
+                (10 + bar_length, y_offset + 15),
+                (0, 255, 0), -1
             )
-            cv2.putText(
-                panel, confidence_text, (10, y_offset + 60),
-                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2
-            )
-            
-            # 合并图像和面板
-            image = np.hstack([image, panel])
             
-            logger.info(f"显示了 {len(sorted_blendshapes)} 个混合形状")
+            y_offset += 35
+        
+        # 显示主导情感
+        emotion_text = f"Emotion: {percept.metadata['dominant_emotion'].upper()}"
+        confidence_text = f"Confidence: {percept.confidence:.1%}"
+        
+        cv2.putText(
+            panel, emotion_text, (10, y_offset + 30),
+            cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2
+        )
+        cv2.putText(
+            panel, confidence_text, (10, y_offset + 60),
+            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2
+        )
+        
+        image = canvas
+        
+        logger.info(f"显示了 {len(sorted_blendshapes)} 个混合形状")
     
     # 保存输出
     if output_path:
@@ -914,87 +1857,80 @@ def visualize_all_faces(
     h, w = image.shape[:2]
     
     # 使用VisionPerceptor进行分析（使用自定义置信度）
-    with VisionPerceptor(
-        camera_id=-1,
-        use_mediapipe=True,
-        use_landmarks=True,
-        min_confidence=min_confidence
-    ) as vp:
+    with _PERCEPTORS_LOCK:
+        vp = _get_perceptor(use_mediapipe=True, use_landmarks=True, min_confidence=min_confidence)
         percepts = vp.perceive_all_faces(image, max_faces=max_faces)
+    
+    if not percepts:
+        logger.warning("未检测到人脸")
+        return image
+    
+    # 为每张人脸分配不同的颜色
+    colors = [
+        (255, 0, 0),    # 蓝色
+        (0, 255, 0),    # 绿色
+        (0, 0, 255),    # 红色
+        (255, 255, 0),  # 青色
+        (255, 0, 255),  # 品红
+        (0, 255, 255),  # 黄色
+        (128, 0, 128),  # 紫色
+        (255, 128, 0),  # 橙色
+        (0, 128, 255),  # 天蓝
+        (128, 255, 0),  # 黄绿
+    ]
+    
+    logger.info(f"处理 {len(percepts)} 张人脸")
+    
+    # 先收集所有人脸的绘制内容，循环结束后一次性绘制：
+    # 特征点像素坐标及对应颜色、边界框 (左上, 右下, 颜色)、文字 (内容, 位置, 字号, 颜色)
+    point_arrays = []
+    point_colors = []
+    boxes = []
+    texts = []
+    valid_faces = 0
+    
+    # 处理每张人脸
+    for idx, percept in enumerate(percepts):
+        if percept is None:
+            continue
         
-        if not percepts:
-            logger.warning("未检测到人脸")
-            return image
-        
-        # 为每张人脸分配不同的颜色
-        colors = [
-            (255, 0, 0),    # 蓝色
-            (0, 255, 0),    # 绿色
-            (0, 0, 255),    # 红色
-            (255, 255, 0),  # 青色
-            (255, 0, 255),  # 品红
-            (0, 255, 255),  # 黄色
-            (128, 0, 128),  # 紫色
-            (255, 128, 0),  # 橙色
-            (0, 128, 255),  # 天蓝
-            (128, 255, 0),  # 黄绿
-        ]
-        
-        logger.info(f"处理 {len(percepts)} 张人脸")
+        valid_faces += 1
+        color = colors[idx % len(colors)]
         
-        # 处理每张人脸
-        for idx, percept in enumerate(percepts):
-            if percept is None:
-                continue
-            
-            color = colors[idx % len(colors)]
-            
-            # 绘制人脸边界框
-            if 'bounding_box' in percept.metadata:
-                x, y, fw, fh = percept.metadata['bounding_box']
-                cv2.rectangle(image, (x, y), (x+fw, y+fh), color, 2)
-                
-                # 显示人脸编号
-                label = f"Face #{idx+1}"
-                cv2.putText(
-                    image, label, (x, y-10),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2
-                )
+        # 人脸边界框与编号
+        if 'bounding_box' in percept.metadata:
+            x, y, fw, fh = percept.metadata['bounding_box']
+            boxes.append(((x, y), (x+fw, y+fh), color))
+            texts.append((f"Face #{idx+1}", (x, y-10), 0.6, color))
             
-            # 显示情感标签
+            # 情感标签（边界框底部）
             if show_emotions and 'dominant_emotion' in percept.metadata:
                 emotion = percept.metadata['dominant_emotion'].upper()
-                confidence = percept.confidence
-                emotion_text = f"{emotion} {confidence:.0%}"
-                
-                # 计算文本位置（边界框底部）
-                x, y, fw, fh = percept.metadata['bounding_box']
-                text_y = y + fh + 20
-                
-                cv2.putText(
-                    image, emotion_text, (x, text_y),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2
-                )
-            
-            # 绘制人脸特征点
-            if show_landmarks and 'face_landmarks' in percept.metadata:
-                landmarks = percept.metadata['face_landmarks']
-                for landmark in landmarks:
-                    # 转换归一化坐标到像素坐标
-                    px = int(landmark['x'] * w)
-                    py = int(landmark['y'] * h)
-                    # 绘制小圆点（使用对应人脸的颜色）
-                    cv2.circle(image, (px, py), 1, color, -1)
-        
-        # 在图像顶部显示统计信息
-        valid_faces = sum(1 for p in percepts if p is not None)
-        stats_text = f"Detected {valid_faces}/{len(percepts)} valid faces"
-        cv2.putText(
-            image, stats_text, (10, 30),
-            cv2.FONT_HERSHEY_SIMPLEX, 1.0, (255, 255, 255), 2
-        )
-        
-        logger.info(f"已标注 {valid_faces} 张有效人脸")
+                emotion_text = f"{emotion} {percept.confidence:.0%}"
+                texts.append((emotion_text, (x, y + fh + 20), 0.5, color))
+        
+        # 收集人脸特征点（使用对应人脸的颜色）
+        if show_landmarks and 'face_landmarks_xy' in percept.metadata:
+            landmarks = percept.metadata['face_landmarks_xy']
+            point_arrays.append(landmarks)
+            point_colors.append(np.full((len(landmarks), 3), color, dtype=np.uint8))
+    
+    # 一次绘制所有人脸的特征点（归一化坐标转换为像素坐标）
+    if point_arrays:
+        points = _landmarks_to_pixels(np.concatenate(point_arrays), w, h)
+        _draw_points(image, points, np.concatenate(point_colors))
+    
+    # 边界框与文字绘制在特征点之上
+    for pt1, pt2, color in boxes:
+        cv2.rectangle(image, pt1, pt2, color, 2)
+    
+    # 在图像顶部显示统计信息
+    stats_text = f"Detected {valid_faces}/{len(percepts)} valid faces"
+    texts.append((stats_text, (10, 30), 1.0, (255, 255, 255)))
+    for text, org, scale, color in texts:
+        cv2.putText(image, text, org, cv2.FONT_HERSHEY_SIMPLEX, scale, color, 2)
+    
+    logger.info(f"已标注 {valid_faces} 张有效人脸")
     
     # 保存输出
     if output_path:
@@ -1,5 +1,5 @@
 """工具模块"""
 
-from .database import EmotionDatabase
+from .database import EmotionDatabase, Detection
 
-__all__ = ['EmotionDatabase']
+__all__ = ['EmotionDatabase', 'Detection']
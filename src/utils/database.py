@@ -4,11 +4,87 @@
 """
 
 import sqlite3
+from itertools import groupby
+from operator import itemgetter
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, asdict, fields
 from pathlib import Path
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Union
 import json
 
+# detections 表插入时写入的列（与 _detection_row 返回的元组顺序一致）
+DETECTION_COLUMNS = (
+    "timestamp", "image_file", "expected_category", "detected_emotion",
+    "confidence", "detector_type", "face_x", "face_y", "face_w", "face_h",
+    "valence", "arousal", "dominance", "source", "is_correct", "output_image",
+)
+
+# SQLite 单条语句的参数个数上限（SQLITE_MAX_VARIABLE_NUMBER 的旧默认值）
+SQLITE_MAX_PARAMS = 999
+
+# 插入语句（模块级常量，SQL文本只构造一次，连接的语句缓存可直接命中）
+_INSERT_DETECTION_PREFIX = f"INSERT INTO detections ({', '.join(DETECTION_COLUMNS)}) VALUES "
+_DETECTION_PLACEHOLDER = "(" + ", ".join("?" * len(DETECTION_COLUMNS)) + ")"
+_INSERT_DETECTION_SQL = _INSERT_DETECTION_PREFIX + _DETECTION_PLACEHOLDER
+_INSERT_PROB_SQL = (
+    "INSERT INTO emotion_probabilities (detection_id, emotion, probability) VALUES (?, ?, ?)"
+)
+
+# 连接的预编译语句缓存大小（默认128）
+CACHED_STATEMENTS = 256
+
+
+@dataclass(slots=True, frozen=True)
+class Detection:
+    """detections 表的一行记录
+    
+    字段顺序与 _SELECT_DETECTION_SQL 的列顺序一致，
+    相比 dict(row) 没有逐行的哈希表开销。
+    """
+    
+    id: int
+    timestamp: str
+    image_file: str
+    expected_category: Optional[str]
+    detected_emotion: str
+    confidence: float
+    detector_type: str
+    face_x: Optional[int]
+    face_y: Optional[int]
+    face_w: Optional[int]
+    face_h: Optional[int]
+    valence: float
+    arousal: float
+    dominance: float
+    source: Optional[str]
+    is_correct: Optional[int]
+    output_image: Optional[str]
+    created_at: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典（如用于JSON序列化）"""
+        return asdict(self)
+
+
+# 按 Detection 字段顺序查询 detections 表
+_SELECT_DETECTION_SQL = (
+    f"SELECT id, {', '.join(DETECTION_COLUMNS)}, created_at FROM detections"
+)
+
+
+def _detection_factory(cursor: sqlite3.Cursor, row: tuple) -> Detection:
+    """sqlite3 行工厂：直接构造 Detection，不经过 sqlite3.Row"""
+    return Detection(*row)
+
+
+_DETECTION_FIELDS = tuple(f.name for f in fields(Detection))
+
+
+def _detection_dict_factory(cursor: sqlite3.Cursor, row: tuple) -> Dict[str, Any]:
+    """sqlite3 行工厂：按 Detection 字段名构造字典"""
+    return dict(zip(_DETECTION_FIELDS, row))
+
 
 class EmotionDatabase:
     """情感检测结果数据库"""
@@ -21,12 +97,35 @@ class EmotionDatabase:
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.conn = sqlite3.connect(str(self.db_path))
+        # isolation_level=None：不由 sqlite3 模块隐式开启事务，事务边界由 transaction() 控制
+        self.conn = sqlite3.connect(
+            str(self.db_path),
+            cached_statements=CACHED_STATEMENTS,
+            isolation_level=None
+        )
         self.conn.row_factory = sqlite3.Row  # 使用字典访问
+        self._configure_connection()
         self._create_tables()
     
+    def _configure_connection(self):
+        """设置连接级 PRAGMA
+        
+        - WAL 日志 + synchronous=NORMAL：提交时只需顺序追加 WAL，不再每次多次 fsync
+        - 临时表与排序使用内存，页缓存 64MB，内存映射 256MB
+        - 启用外键约束
+        - 限制 ANALYZE 的采样行数（见 analyze()）
+        """
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-65536")
+        self.conn.execute("PRAGMA mmap_size=268435456")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        # ANALYZE 每个索引最多采样约400行，统计信息近似但开销与表大小无关
+        self.conn.execute("PRAGMA analysis_limit=400")
+    
     def _create_tables(self):
-        """创建数据库表"""
+        """创建数据库表（自动提交模式下每条DDL语句各自提交）"""
         cursor = self.conn.cursor()
         
         # 检测结果主表
@@ -77,8 +176,20 @@ class EmotionDatabase:
             CREATE INDEX IF NOT EXISTS idx_detections_expected 
             ON detections(expected_category)
         """)
-        
-        self.conn.commit()
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_detections_created_at 
+            ON detections(created_at)
+        """)
+        # 部分索引：只收录检测正确的记录，统计正确数时只需计数索引条目
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_detections_correct 
+            ON detections(detected_emotion) WHERE is_correct = 1
+        """)
+        # 覆盖索引：按 detection_id 查询情感概率时只需扫描索引，不回表
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_probs_detection 
+            ON emotion_probabilities(detection_id, emotion, probability)
+        """)
     
     def save_detection(
         self,
@@ -91,10 +202,18 @@ class EmotionDatabase:
         all_emotions: Dict[str, float],
         expected_category: Optional[str] = None,
         source: str = "vision",
-        output_image: Optional[str] = None
+        output_image: Optional[str] = None,
+        auto_commit: bool = True
     ) -> int:
         """保存检测结果
         
+        连续保存多条结果时，在 transaction() 中调用并传入 auto_commit=False
+        （不再单独开启事务），只在事务结束时提交一次::
+        
+            with db.transaction():
+                for result in results:
+                    db.save_detection(..., auto_commit=False)
+        
         Args:
             image_file: 图片文件名
             detected_emotion: 检测到的情感
@@ -106,12 +225,106 @@ class EmotionDatabase:
             expected_category: 预期类别
             source: 数据源
             output_image: 输出图片路径
+            auto_commit: 是否在独立的事务中插入并立即提交。为False且不在事务中时
+                开启一个事务并保持打开，由调用方 conn.commit() 提交
         
         Returns:
             detection_id: 插入记录的ID
         """
-        cursor = self.conn.cursor()
+        if not auto_commit and not self.conn.in_transaction:
+            # isolation_level=None 下不会隐式开启事务，需显式 BEGIN 才能由调用方提交
+            self.conn.execute("BEGIN")
+        
+        with self.transaction() if auto_commit else nullcontext():
+            cursor = self.conn.cursor()
+            
+            # 插入主记录
+            cursor.execute(_INSERT_DETECTION_SQL, self._detection_row(
+                image_file, detected_emotion, confidence, detector_type, face_box,
+                vad_values, expected_category, source, output_image
+            ))
+            
+            detection_id = cursor.lastrowid
+            
+            # 插入情感概率
+            cursor.executemany(_INSERT_PROB_SQL, [
+                (detection_id, emotion, probability)
+                for emotion, probability in all_emotions.items()
+            ])
+        
+        return detection_id
+    
+    def save_detections(self, records: List[Dict[str, Any]]) -> List[int]:
+        """在一个事务中批量保存多条检测结果
+        
+        主记录使用多行 VALUES 的 INSERT 分批插入（每条语句的参数个数不超过
+        SQLITE_MAX_PARAMS），情感概率使用 executemany 插入，最后只提交一次。
+        
+        Args:
+            records: 检测结果列表，每项为 save_detection() 的关键字参数字典
+        
+        Returns:
+            与 records 顺序一致的 detection_id 列表
+        """
+        if not records:
+            return []
+        
+        rows_per_insert = SQLITE_MAX_PARAMS // len(DETECTION_COLUMNS)
+        detection_ids = []
+        
+        with self.transaction():
+            cursor = self.conn.cursor()
+            for start in range(0, len(records), rows_per_insert):
+                chunk = records[start:start + rows_per_insert]
+                params = []
+                for record in chunk:
+                    params.extend(self._detection_row(
+                        record['image_file'], record['detected_emotion'],
+                        record['confidence'], record['detector_type'],
+                        record['face_box'], record['vad_values'],
+                        record.get('expected_category'), record.get('source', "vision"),
+                        record.get('output_image')
+                    ))
+                
+                cursor.execute(
+                    _INSERT_DETECTION_PREFIX + ", ".join([_DETECTION_PLACEHOLDER] * len(chunk)),
+                    params
+                )
+                # 同一条 INSERT 插入的行在事务内获得连续的自增ID
+                last_id = cursor.lastrowid
+                detection_ids.extend(range(last_id - len(chunk) + 1, last_id + 1))
+            
+            cursor.executemany(_INSERT_PROB_SQL, [
+                (detection_id, emotion, probability)
+                for detection_id, record in zip(detection_ids, records)
+                for emotion, probability in record['all_emotions'].items()
+            ])
+        
+        return detection_ids
+    
+    def analyze(self):
+        """更新查询规划器使用的统计信息（sqlite_stat1）
         
+        有多个索引可选时（如 detected_emotion / expected_category），
+        规划器依据统计信息比较索引的选择性。
+        close() 会执行 PRAGMA optimize 按需更新统计信息；
+        一次导入大量数据后需要立即查询时可手动调用。
+        """
+        self.conn.execute("ANALYZE")
+    
+    @staticmethod
+    def _detection_row(
+        image_file: str,
+        detected_emotion: str,
+        confidence: float,
+        detector_type: str,
+        face_box: tuple,
+        vad_values: tuple,
+        expected_category: Optional[str],
+        source: str,
+        output_image: Optional[str]
+    ) -> tuple:
+        """构造 detections 表的一行参数（列顺序见 DETECTION_COLUMNS）"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         x, y, w, h = face_box
         valence, arousal, dominance = vad_values
@@ -121,30 +334,30 @@ class EmotionDatabase:
         if expected_category:
             is_correct = (detected_emotion.lower() == expected_category.lower())
         
-        # 插入主记录
-        cursor.execute("""
-            INSERT INTO detections (
-                timestamp, image_file, expected_category, detected_emotion,
-                confidence, detector_type, face_x, face_y, face_w, face_h,
-                valence, arousal, dominance, source, is_correct, output_image
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        return (
             timestamp, image_file, expected_category, detected_emotion,
             confidence, detector_type, x, y, w, h,
             valence, arousal, dominance, source, is_correct, output_image
-        ))
-        
-        detection_id = cursor.lastrowid
-        
-        # 插入情感概率
-        for emotion, probability in all_emotions.items():
-            cursor.execute("""
-                INSERT INTO emotion_probabilities (detection_id, emotion, probability)
-                VALUES (?, ?, ?)
-            """, (detection_id, emotion, probability))
+        )
+    
+    @contextmanager
+    def transaction(self):
+        """显式事务：正常退出时提交，发生异常时回滚
         
-        self.conn.commit()
-        return detection_id
+        已在事务中时直接加入外层事务，由外层负责提交。
+        """
+        if self.conn.in_transaction:
+            yield self
+            return
+        
+        self.conn.execute("BEGIN")
+        try:
+            yield self
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        else:
+            self.conn.execute("COMMIT")
     
     def get_detection(self, detection_id: int) -> Optional[Dict[str, Any]]:
         """获取检测结果
@@ -181,24 +394,29 @@ class EmotionDatabase:
         
         return result
     
-    def get_recent_detections(self, limit: int = 10) -> List[Dict[str, Any]]:
+    def get_recent_detections(
+        self,
+        limit: int = 10,
+        as_dataclass: bool = False
+    ) -> Union[List[Dict[str, Any]], List[Detection]]:
         """获取最近的检测结果
         
         Args:
             limit: 返回记录数
+            as_dataclass: 是否返回 Detection 对象（省去逐行构造字典的开销）
         
         Returns:
-            检测结果列表
+            检测结果列表，默认每项为字典；as_dataclass=True 时为 Detection
         """
         cursor = self.conn.cursor()
+        cursor.row_factory = _detection_factory if as_dataclass else _detection_dict_factory
         
-        cursor.execute("""
-            SELECT * FROM detections 
+        cursor.execute(_SELECT_DETECTION_SQL + """
             ORDER BY created_at DESC 
             LIMIT ?
         """, (limit,))
         
-        return [dict(row) for row in cursor.fetchall()]
+        return cursor.fetchall()
     
     def get_statistics(self, emotion: Optional[str] = None) -> Dict[str, Any]:
         """获取统计信息
@@ -216,19 +434,20 @@ class EmotionDatabase:
             cursor.execute("""
                 SELECT 
                     COUNT(*) as total,
-                    SUM(CASE WHEN is_correct = 1 THEN 1 ELSE 0 END) as correct,
+                    (SELECT COUNT(*) FROM detections
+                     WHERE detected_emotion = ?1 AND is_correct = 1) as correct,
                     AVG(confidence) as avg_confidence,
                     AVG(valence) as avg_valence,
                     AVG(arousal) as avg_arousal,
                     AVG(dominance) as avg_dominance
                 FROM detections
-                WHERE detected_emotion = ?
+                WHERE detected_emotion = ?1
             """, (emotion,))
         else:
             cursor.execute("""
                 SELECT 
                     COUNT(*) as total,
-                    SUM(CASE WHEN is_correct = 1 THEN 1 ELSE 0 END) as correct,
+                    (SELECT COUNT(*) FROM detections WHERE is_correct = 1) as correct,
                     AVG(confidence) as avg_confidence,
                     AVG(valence) as avg_valence,
                     AVG(arousal) as avg_arousal,
@@ -275,39 +494,46 @@ class EmotionDatabase:
     def export_to_json(self, output_path: str, limit: Optional[int] = None):
         """导出数据到JSON
         
+        边查询边写入文件，不在内存中保留全部记录（输出格式与 json.dump(..., indent=2) 相同）。
+        
         Args:
             output_path: 输出文件路径
             limit: 限制导出记录数（可选）
         """
         cursor = self.conn.cursor()
         
-        query = "SELECT * FROM detections ORDER BY created_at DESC"
-        if limit:
-            query += f" LIMIT {limit}"
-        
-        cursor.execute(query)
-        detections = []
-        
-        for row in cursor.fetchall():
-            detection = dict(row)
-            
-            # 获取情感概率
-            cursor.execute("""
-                SELECT emotion, probability 
-                FROM emotion_probabilities 
-                WHERE detection_id = ?
-            """, (detection['id'],))
-            
-            detection['emotion_probabilities'] = {
-                r['emotion']: r['probability']
-                for r in cursor.fetchall()
-            }
-            
-            detections.append(detection)
-        
-        # 写入JSON
+        # 一次 JOIN 查询取出检测记录及其情感概率（同一检测的行相邻）
+        # LIMIT 以参数传入（-1 表示不限制），SQL 文本固定，可复用缓存的预编译语句
+        cursor.execute("""
+            SELECT d.*, p.emotion AS prob_emotion, p.probability AS prob_value
+            FROM (
+                SELECT * FROM detections ORDER BY created_at DESC, id DESC LIMIT ?
+            ) d
+            LEFT JOIN emotion_probabilities p ON p.detection_id = d.id
+            ORDER BY d.created_at DESC, d.id DESC
+        """, (limit if limit else -1,))
+        
+        # 逐条写入JSON数组
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(detections, f, indent=2, ensure_ascii=False)
+            separator = "[\n  "
+            for _, rows in groupby(cursor, key=itemgetter('id')):
+                rows = list(rows)
+                detection = dict(rows[0])
+                del detection['prob_emotion'], detection['prob_value']
+                
+                # 情感概率（没有概率记录时 LEFT JOIN 得到一行 NULL）
+                detection['emotion_probabilities'] = {
+                    r['prob_emotion']: r['prob_value']
+                    for r in rows
+                    if r['prob_emotion'] is not None
+                }
+                
+                # 数组元素整体缩进一级（字符串中的换行已转义，不受影响）
+                f.write(separator)
+                f.write(json.dumps(detection, indent=2, ensure_ascii=False).replace("\n", "\n  "))
+                separator = ",\n  "
+            
+            f.write("[]" if separator == "[\n  " else "\n]")
     
     def clear_old_records(self, days: int = 30):
         """清理旧记录
@@ -315,26 +541,31 @@ class EmotionDatabase:
         Args:
             days: 保留最近N天的记录
         """
-        cursor = self.conn.cursor()
-        
-        cursor.execute("""
-            DELETE FROM emotion_probabilities
-            WHERE detection_id IN (
-                SELECT id FROM detections
-                WHERE datetime(created_at) < datetime('now', '-' || ? || ' days')
-            )
-        """, (days,))
-        
-        cursor.execute("""
-            DELETE FROM detections
-            WHERE datetime(created_at) < datetime('now', '-' || ? || ' days')
-        """, (days,))
+        # 在Python中算出截止时间（created_at 为 CURRENT_TIMESTAMP 写入的UTC时间），
+        # 直接与列值比较，不对列调用 datetime()，查询可以使用 created_at 索引
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%d %H:%M:%S")
         
-        self.conn.commit()
+        with self.transaction():
+            cursor = self.conn.cursor()
+            
+            cursor.execute("""
+                DELETE FROM emotion_probabilities
+                WHERE detection_id IN (
+                    SELECT id FROM detections WHERE created_at < ?
+                )
+            """, (cutoff,))
+            
+            cursor.execute("""
+                DELETE FROM detections WHERE created_at < ?
+            """, (cutoff,))
     
     def close(self):
-        """关闭数据库连接"""
+        """关闭数据库连接（关闭前按需更新统计信息），重复调用时直接返回"""
+        if self.conn is None:
+            return
+        self.conn.execute("PRAGMA optimize")
         self.conn.close()
+        self.conn = None
     
     def __enter__(self):
         return self
@@ -0,0 +1,141 @@
+"""人脸感知模块测试
+
+不依赖 MediaPipe/FER 模型：用假的特征点检测器和情感分类器替换真实模型，
+只验证 VisionPerceptor 自身的处理逻辑。
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+import src.perception.human_face as human_face
+from src.perception.human_face import VisionPerceptor
+
+
+FRAME_W, FRAME_H = 640, 480
+
+
+def _face_landmarks(index: int):
+    """第 index 张人脸的假特征点：沿画面横向排列的 40x40 像素方框的四个角"""
+    x0 = (20 + 50 * index) / FRAME_W
+    y0 = 100 / FRAME_H
+    x1 = x0 + 40 / FRAME_W
+    y1 = y0 + 40 / FRAME_H
+    return [SimpleNamespace(x=x, y=y, z=0.0) for x, y in ((x0, y0), (x1, y0), (x0, y1), (x1, y1))]
+
+
+class FakeLandmarker:
+    """按 num_faces 截断结果的假 FaceLandmarker"""
+
+    def __init__(self, num_faces: int, faces_in_frame: int):
+        self.num_faces = num_faces
+        self.faces_in_frame = faces_in_frame
+        self.closed = False
+
+    def detect(self, mp_image):
+        n = min(self.num_faces, self.faces_in_frame)
+        return SimpleNamespace(
+            face_landmarks=[_face_landmarks(i) for i in range(n)],
+            face_blendshapes=None
+        )
+
+    def close(self):
+        self.closed = True
+
+
+class FakeClassifier:
+    """对每张人脸都返回 happy 的假情感分类器"""
+
+    def predict_batch(self, faces):
+        return [
+            {**{emotion: 0.0 for emotion in human_face.EMOTION_ORDER}, "happy": 0.9}
+            for _ in faces
+        ]
+
+
+def _make_perceptor(monkeypatch, faces_in_frame: int) -> VisionPerceptor:
+    """构造人脸框由特征点得到的感知器（跳过 __init__ 中的模型加载）"""
+    def create_task(self, task_cls, options_cls, model_path, running_mode=None, **options):
+        return FakeLandmarker(options["num_faces"], faces_in_frame)
+
+    monkeypatch.setattr(human_face, "mp_vision", SimpleNamespace(
+        FaceLandmarker=None,
+        FaceLandmarkerOptions=None,
+        RunningMode=SimpleNamespace(IMAGE="image", VIDEO="video"),
+    ), raising=False)
+    monkeypatch.setattr(VisionPerceptor, "_create_mediapipe_task", create_task)
+    monkeypatch.setattr(VisionPerceptor, "_preprocess_frame", lambda self, frame, reuse_buffer=True: frame)
+    monkeypatch.setattr(VisionPerceptor, "_mediapipe_inputs", lambda self, frame: (None, object()))
+
+    vp = VisionPerceptor.__new__(VisionPerceptor)
+    vp._pipeline_threads = []
+    vp._capture_thread = None
+    vp.cap = None
+    vp.use_landmarks = True
+    vp._faces_from_landmarks = True
+    vp._landmarker_model_path = None
+    vp._landmarker_options = {"num_faces": VisionPerceptor.MAX_LANDMARK_FACES}
+    vp.face_landmarker = FakeLandmarker(VisionPerceptor.MAX_LANDMARK_FACES, faces_in_frame)
+    vp.face_landmarker_video = None
+    vp._video_landmarker_failed = False
+    vp.emotion_classifier = FakeClassifier()
+    vp.min_confidence = 0.3
+    vp._face_batch = None
+    vp._gray_buf = None
+    return vp
+
+
+@pytest.mark.parametrize("faces_in_frame, max_faces, expected", [
+    (8, 10, 8),
+    (12, 10, 10),
+    (8, 3, 3),
+])
+def test_perceive_all_faces_not_capped_by_landmarker(monkeypatch, faces_in_frame, max_faces, expected):
+    """max_faces 超过特征点检测器默认的 num_faces 时仍返回全部人脸"""
+    vp = _make_perceptor(monkeypatch, faces_in_frame)
+    frame = np.zeros((FRAME_H, FRAME_W, 3), dtype=np.uint8)
+
+    percepts = vp.perceive_all_faces(frame, max_faces=max_faces)
+
+    assert len(percepts) == expected
+    assert all(p is not None for p in percepts)
+    assert len({tuple(p.metadata["bounding_box"]) for p in percepts}) == expected
+
+
+def test_landmarker_rebuilt_only_when_needed(monkeypatch):
+    """只有请求的人脸数超过当前 num_faces 时才重建检测器"""
+    vp = _make_perceptor(monkeypatch, faces_in_frame=8)
+    original = vp.face_landmarker
+
+    vp._ensure_landmarker_capacity(VisionPerceptor.MAX_LANDMARK_FACES)
+    assert vp.face_landmarker is original
+
+    vp._ensure_landmarker_capacity(8)
+    assert original.closed
+    assert vp.face_landmarker.num_faces == 8
+    assert vp._landmarker_options["num_faces"] == 8
+
+
+def test_perceive_all_faces_without_frame_rejected_while_pipeline_running(monkeypatch):
+    """流水线运行期间不能再从摄像头直接读取"""
+    vp = _make_perceptor(monkeypatch, faces_in_frame=1)
+    vp._pipeline_threads = [object()]
+    monkeypatch.setattr(VisionPerceptor, "_next_camera_frame",
+                        lambda self, timeout=1.0: pytest.fail("camera read while pipeline running"))
+
+    with pytest.raises(RuntimeError):
+        vp.perceive_all_faces()
+
+    vp._pipeline_threads = []
+
+
+def test_percept_values_keep_python_float_precision(monkeypatch):
+    """置信度与VAD提示不经过 float32 转换"""
+    vp = _make_perceptor(monkeypatch, faces_in_frame=1)
+    frame = np.zeros((FRAME_H, FRAME_W, 3), dtype=np.uint8)
+
+    (percept,) = vp.perceive_all_faces(frame, max_faces=1)
+
+    assert percept.confidence == 0.9
+    assert (percept.valence_hint, percept.arousal_hint, percept.dominance_hint) == (0.8, 0.7, 0.5)